@@ -4,13 +4,16 @@ import logging
 from pathlib import Path
 import importlib.util
 
+# Package directory, resolved once and reused for .env lookup and output paths
+PROJECT_ROOT = Path(__file__).resolve().parent
+
 # --- Third-Party Imports ---
 # Environment Variable Loading (using python-dotenv)
 try:
     from dotenv import load_dotenv
 
     # Try loading from the project root
-    dotenv_path_project_root = Path(__file__).resolve().parent / ".env"
+    dotenv_path_project_root = PROJECT_ROOT / ".env"
     if dotenv_path_project_root.exists():
         load_dotenv(dotenv_path=dotenv_path_project_root)
         print(f"Loaded environment variables from: {dotenv_path_project_root}")
@@ -42,7 +45,6 @@ except ImportError:
     sys.exit(1)
 
 # --- Constants ---
-PROJECT_ROOT = Path(__file__).resolve().parent
 LOGS_DIR = PROJECT_ROOT / "logs"
 OUTPUTS_DIR_BASE = PROJECT_ROOT / "outputs"
 DOMAIN_OUTPUT_DIR = OUTPUTS_DIR_BASE / "01_domain_identifier"
@@ -141,14 +143,67 @@ BINARY_FILE_EXTENSIONS = {
     ".mdb",
 }
 
+
+# --- Environment Parsing Helpers ---
+def _env_int(name: str, default: int, minimum: int) -> int:
+    """Reads an integer setting from the environment, clamped to ``minimum``.
+
+    Values that are not plain integers (e.g. ``5,000,000``) are reported with a
+    warning and replaced by ``default`` instead of failing the import.
+    """
+    raw_value = os.getenv(name)
+    if raw_value is None:
+        return max(minimum, default)
+    try:
+        value = int(raw_value)
+    except ValueError:
+        logging.getLogger(__name__).warning(
+            "Ignoring %s=%r: not an integer. Using the default (%d).",
+            name,
+            raw_value,
+            default,
+        )
+        value = default
+    return max(minimum, value)
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    """Reads a boolean setting from the environment (``1``/``true``/``yes``)."""
+    return os.getenv(name, "true" if default else "false").lower() in (
+        "1",
+        "true",
+        "yes",
+    )
+
+
 # Default model to use if environment variables are not set
 DEFAULT_MODEL = "gpt-4o-mini"
 # Threshold for warning about large input content size
 MAX_INPUT_CONTENT_LENGTH = 1_000_000  # Warn if input exceeds 1 million characters
+# Inputs above this size are rejected unless --force is given
+HARD_MAX_INPUT_CONTENT_LENGTH = _env_int("HARD_MAX_INPUT_CONTENT_LENGTH", 5_000_000, 0)
+# Maximum number of per-sub-domain topic agent calls in flight at once (Step 3)
+TOPIC_MAX_CONCURRENCY = _env_int("TOPIC_MAX_CONCURRENCY", 8, 1)
+# Sub-domains covered by one topic agent call in Step 3 (1 = one call per sub-domain)
+TOPIC_SUBDOMAIN_BATCH_SIZE = _env_int("TOPIC_SUBDOMAIN_BATCH_SIZE", 1, 1)
+# Write each step's result to its JSON output file (results stay in memory either way)
+SAVE_INTERMEDIATE_OUTPUTS = _env_flag("SAVE_INTERMEDIATE_OUTPUTS", True)
+# Longest document excerpt sent to the Step 4d/4e type agents (0 = whole text)
+TYPE_ID_MAX_PROMPT_CHARS = _env_int("TYPE_ID_MAX_PROMPT_CHARS", 0, 0)
+# Print full structured step results (large JSON) to the console
+VERBOSE_OUTPUT = _env_flag("GRAPHYTE_VERBOSE_OUTPUT", False)
+# Shared budget of agent runs per minute across all steps (0 = unlimited)
+AGENT_RATE_LIMIT_PER_MIN = _env_int("AGENT_RATE_LIMIT_PER_MIN", 0, 0)
+# Reuse agent results from earlier runs when the inputs are identical
+RESULT_CACHE_ENABLED = _env_flag("RESULT_CACHE_ENABLED", False)
+RESULT_CACHE_DIR = OUTPUTS_DIR_BASE / "cache"
+TOPIC_CACHE_DIR = RESULT_CACHE_DIR / "03_topic_identifier"
+AGENT_CACHE_DIR = RESULT_CACHE_DIR / "agent_runs"
 
 # Check optional dependencies availability (useful for utils module)
 PYMUPDF_AVAILABLE = importlib.util.find_spec("fitz") is not None
 TENACITY_AVAILABLE = importlib.util.find_spec("tenacity") is not None
+UVLOOP_AVAILABLE = importlib.util.find_spec("uvloop") is not None
 
 # --- Configuration Loading ---
 # Load model names from environment variables, falling back to the default
@@ -179,6 +234,9 @@ RELATIONSHIP_MODEL = os.getenv("RELATIONSHIP_IDENTIFIER_MODEL", DEFAULT_MODEL)
 RELATIONSHIP_INSTANCE_MODEL = os.getenv(
     "RELATIONSHIP_INSTANCE_EXTRACTOR_MODEL", DEFAULT_MODEL
 )
+# Model for the confidence/relevance/clarity scorers, which run once per
+# identified item and can use a cheaper, faster tier than the identifiers
+SCORING_MODEL = os.getenv("SCORING_MODEL", DEFAULT_MODEL)
 # Load OpenAI API Key from environment variable
 API_KEY = os.getenv("OPENAI_API_KEY")
 # Load optional base URL for tracing platform
@@ -9,7 +9,7 @@ try:
     from .utils import (
         parse_arguments,
         read_input_from_file,
-        read_input_from_directory,
+        read_input_from_directory_async,
         prompt_user_for_input,
         setup_logging,
     )
@@ -17,7 +17,9 @@ try:
     from .steps import generate_workflow_visualization
     from .config import (
         PYMUPDF_AVAILABLE,
+        UVLOOP_AVAILABLE,
         MAX_INPUT_CONTENT_LENGTH,
+        HARD_MAX_INPUT_CONTENT_LENGTH,
     )  # For initial logging
 except ImportError as e:
     print(
@@ -40,23 +42,15 @@ logger = logging.getLogger(__name__)  # Get logger for the main script
 async def main_async() -> None:
     """Main asynchronous function to parse arguments, read input, and orchestrate the agent workflow."""
     logger.info("=== Starting Document Analysis Workflow ===")
-    try:
-        # Optional: Timezone context logging
-        import pytz  # type: ignore
-
-        tz = pytz.timezone("Etc/UTC")  # Or try to get local timezone
-        logger.info(f"Using timezone context: {tz.zone}")
-    except ImportError:
-        # Fallback if pytz is not installed
-        # Use the timezone already imported at the top of the file
-        tz = timezone.utc
-        logger.warning("pytz library not found. Using UTC for timezone context.")
-
-    current_time = datetime.now(tz)
-    logger.info(f"Workflow start time: {current_time.isoformat()}")
+    if sys.version_info >= (3, 12):
+        # Run each new task's synchronous prelude inline until its first real await,
+        # saving a loop iteration per task in the agent fan-outs
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+    current_time = datetime.now(timezone.utc)
+    logger.info("Workflow start time: %s", current_time.isoformat())
 
     args = parse_arguments()
-    logger.debug(f"Parsed arguments: {args}")
+    logger.debug("Parsed arguments: %s", args)
 
     # --- Handle Visualization Request ---
     if args.visualize:
@@ -66,6 +60,7 @@ async def main_async() -> None:
         sys.exit(0)  # Exit after generating visualization
 
     # --- Proceed with Normal Workflow if not visualizing ---
+    # Input is read in worker threads so the event loop is never blocked on disk/stdin
     content = ""
 
     input_source = "stdin"
@@ -74,29 +69,49 @@ async def main_async() -> None:
             input_source = f"file: {args.file}"
             # Resolve path here for better error messages if it doesn't exist
             file_arg_path = Path(args.file).resolve()
-            content = read_input_from_file(file_arg_path)
+            content = await asyncio.to_thread(read_input_from_file, file_arg_path)
         elif args.dir:
             input_source = f"dir: {args.dir}"
             dir_arg_path = Path(args.dir).resolve()
-            content = read_input_from_directory(dir_arg_path)
+            content = await read_input_from_directory_async(dir_arg_path)
         else:
-            content = prompt_user_for_input()
+            content = await asyncio.to_thread(prompt_user_for_input)
+
+        content_length = len(content)
 
         # Check content length warning
-        if len(content) > MAX_INPUT_CONTENT_LENGTH:
+        if content_length > MAX_INPUT_CONTENT_LENGTH:
             logger.warning(
-                f"Input content length ({len(content)} characters) exceeds threshold ({MAX_INPUT_CONTENT_LENGTH}). May impact performance/cost."
+                "Input content length (%d characters) exceeds threshold (%d). May impact performance/cost.",
+                content_length,
+                MAX_INPUT_CONTENT_LENGTH,
+            )
+            print(
+                f"\nWarning: Input content length ({content_length:,} characters) is large and may result in long processing times or high costs."
+            )
+
+        # Checked on its own so a hard limit set below the warning threshold still applies
+        if content_length > HARD_MAX_INPUT_CONTENT_LENGTH and not args.force:
+            logger.error(
+                "Input content length (%d characters) exceeds hard limit (%d). Aborting; use --force to override.",
+                content_length,
+                HARD_MAX_INPUT_CONTENT_LENGTH,
             )
             print(
-                f"\nWarning: Input content length ({len(content):,} characters) is large and may result in long processing times or high costs."
+                f"Error: Input exceeds the hard limit of {HARD_MAX_INPUT_CONTENT_LENGTH:,} characters. Re-run with --force to process it anyway.",
+                file=sys.stderr,
             )
+            sys.exit(2)
 
         # Proceed only if content is valid (and we are not visualizing)
-        if content and content.strip():
+        # isspace() avoids building a stripped copy of a potentially huge string
+        if content and not content.isspace():
             logger.info(
-                f"Obtained content from {input_source} (length: {len(content)}). Running analysis workflow."
+                "Obtained content from %s (length: %d). Running analysis workflow.",
+                input_source,
+                content_length,
             )
-            await run_combined_workflow(content)
+            await run_combined_workflow(content, content_length=content_length)
 
         else:
             # Log and print specific messages based on the input source if no content was found
@@ -107,13 +122,14 @@ async def main_async() -> None:
                 print("No input content provided. Exiting.")
             elif args.dir:
                 logger.warning(
-                    f"Directory '{args.dir}' provided, but no readable text content found or processed."
+                    "Directory '%s' provided, but no readable text content found or processed.",
+                    args.dir,
                 )
                 print(
                     f"Directory '{args.dir}' provided, but no readable text content found or processed. Exiting."
                 )
             elif args.file:
-                logger.warning(f"File '{args.file}' resulted in empty content.")
+                logger.warning("File '%s' resulted in empty content.", args.file)
                 print(f"File '{args.file}' resulted in empty content. Exiting.")
             else:  # Should not happen if args parsing is correct, but include for completeness
                 logger.warning("No valid input source provided or content was empty.")
@@ -129,7 +145,10 @@ async def main_async() -> None:
         ImportError,
     ) as e:
         logger.exception(
-            f"Input Error processing source '{input_source}': {type(e).__name__}: {e}"
+            "Input Error processing source '%s': %s: %s",
+            input_source,
+            type(e).__name__,
+            e,
         )
         print(
             f"\nError processing input source '{input_source}': {type(e).__name__}: {e}",
@@ -148,7 +167,7 @@ async def main_async() -> None:
     # Catch unexpected errors during input processing or workflow execution
     except Exception as e:
         logger.exception(
-            f"Unhandled exception during processing from '{input_source}'."
+            "Unhandled exception during processing from '%s'.", input_source
         )
         print(
             f"\nAn unexpected error occurred: {type(e).__name__}: {e}", file=sys.stderr
@@ -162,14 +181,28 @@ async def main_async() -> None:
 if __name__ == "__main__":
     # Log initial status using the configured logger
     logger.info(
-        f"Starting main application coroutine using Python {sys.version_info.major}.{sys.version_info.minor}."
+        "Starting main application coroutine using Python %d.%d.",
+        sys.version_info.major,
+        sys.version_info.minor,
     )
     # Optionally log status of dependencies again here if useful
     # if not PYMUPDF_AVAILABLE: logger.warning(...)
     # if not TENACITY_AVAILABLE: logger.warning(...)
 
     try:
-        asyncio.run(main_async())
+        if UVLOOP_AVAILABLE:
+            # Faster event loop for the concurrent agent fan-outs, when installed
+            import uvloop
+
+            logger.info("Using uvloop event loop.")
+            if hasattr(uvloop, "run"):
+                uvloop.run(main_async())
+            else:
+                # uvloop releases before 0.18 have no run(); install its policy instead
+                asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+                asyncio.run(main_async())
+        else:
+            asyncio.run(main_async())
     except KeyboardInterrupt:
         print("\nExecution cancelled by user (KeyboardInterrupt).")
         logger.warning("Execution cancelled by user (KeyboardInterrupt).")
@@ -177,7 +210,9 @@ if __name__ == "__main__":
     except Exception as e:
         # Catch any truly fatal errors not caught within main_async
         logger.critical(
-            f"Fatal error running the application: {type(e).__name__}: {e}",
+            "Fatal error running the application: %s: %s",
+            type(e).__name__,
+            e,
             exc_info=True,
         )
         print(
@@ -9,8 +9,9 @@ This module coordinates the workflow between different agent steps and handles t
 import asyncio  # Added for gather
 import logging
 import sys
-from typing import Any, Optional, List
-
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, List
 
 # Get logger for this module
 logger = logging.getLogger(__name__)
@@ -49,7 +50,7 @@ from .config import (  # noqa: E402
     AGENT_TRACE_BASE_URL,
 )
 from .schemas import (  # noqa: E402
-    DomainResultSchema,  # noqa: F401 - used in step1 output typing
+    DomainResultSchema,
     EntityTypeSchema,
     OntologyTypeSchema,
     EventTypeSchema,
@@ -59,7 +60,6 @@ from .schemas import (  # noqa: E402
     ModalityTypeSchema,
 )
 
-
 # Import steps
 from .steps import (  # noqa: E402
     identify_domain,
@@ -83,12 +83,10 @@ from .steps import (  # noqa: E402
     identify_relationship_types,
     identify_relationship_instances,
 )
+from .utils import full_text_block  # noqa: E402
 
 
 # --- Helper to Run Steps with Individual Traces ---
-from typing import Callable, Awaitable
-
-
 async def run_step_with_trace(
     step_func: Callable[..., Awaitable[Any] | Any],
     step_name: str,
@@ -111,7 +109,7 @@ async def run_step_with_trace(
 
     step_trace_id = gen_trace_id()
     metadata = {"workflow_step": step_name}
-    logger.info(f"Starting {step_name} (Trace ID: {step_trace_id})")
+    logger.info("Starting %s (Trace ID: %s)", step_name, step_trace_id)
     with trace(
         workflow_name=step_name,
         group_id=overall_group_id,
@@ -128,75 +126,232 @@ async def run_step_with_trace(
     return result_val, step_trace_id
 
 
+# --- Helper to Run Independent Steps Concurrently ---
+async def _capture_step_error(step_coro: Awaitable[Any]) -> Any:
+    """Await one step, returning an ordinary exception instead of raising it."""
+    try:
+        return await step_coro
+    except MemoryError:
+        raise
+    except Exception as e:
+        return e
+
+
+async def _run_steps_concurrently(step_coros: List[Awaitable[Any]]) -> List[Any]:
+    """Run independent steps concurrently, returning results or exceptions in order.
+
+    On Python 3.11+ the steps run in an ``asyncio.TaskGroup``: a failing step is
+    reported like with ``gather(..., return_exceptions=True)``, but fatal errors
+    (cancellation, ``MemoryError``) cancel the sibling LLM calls instead of
+    letting them run to completion.
+    """
+    if sys.version_info < (3, 11):
+        return list(await asyncio.gather(*step_coros, return_exceptions=True))
+
+    async with asyncio.TaskGroup() as task_group:
+        tasks = [task_group.create_task(_capture_step_error(c)) for c in step_coros]
+    return [task.result() for task in tasks]
+
+
+# --- Helper to Check Gathered Step Results ---
+def _validate_step_result(
+    step_result: Any, code: str, label: str, schema: Optional[type] = None
+) -> Any:
+    """Unpack one ``run_step_with_trace`` result returned by ``asyncio.gather``.
+
+    Args:
+        step_result: The gathered ``(output, trace_id)`` tuple or the exception raised.
+        code: Step code used in log messages (e.g. "4a").
+        label: Human-readable step label (e.g. "Entity Types").
+        schema: Expected output type. When given, any other non-None output is rejected.
+
+    Returns:
+        The step output, or None if the step failed or returned an unexpected type.
+    """
+    if isinstance(step_result, BaseException):
+        logger.error(
+            "Step %s (%s) failed with exception: %s",
+            code,
+            label,
+            step_result,
+            exc_info=step_result,
+        )
+        return None
+
+    step_output, _ = step_result
+    if schema is None or step_output is None or isinstance(step_output, schema):
+        return step_output
+
+    logger.error(
+        "Step %s (%s) returned unexpected type: %s", code, label, type(step_output)
+    )
+    return None
+
+
+# Step 4 runs these identifiers in parallel: (code, label, step name, function, output schema)
+_STEP4_SPECS = (
+    (
+        "4a",
+        "Entity Types",
+        "step4a_entity_types",
+        identify_entity_types,
+        EntityTypeSchema,
+    ),
+    (
+        "4b",
+        "Ontology Types",
+        "step4b_ontology_types",
+        identify_ontology_types,
+        OntologyTypeSchema,
+    ),
+    ("4c", "Event Types", "step4c_event_types", identify_event_types, EventTypeSchema),
+    (
+        "4d",
+        "Statement Types",
+        "step4d_statement_types",
+        identify_statement_types,
+        StatementTypeSchema,
+    ),
+    (
+        "4e",
+        "Evidence Types",
+        "step4e_evidence_types",
+        identify_evidence_types,
+        EvidenceTypeSchema,
+    ),
+    (
+        "4f",
+        "Measurement Types",
+        "step4f_measurement_types",
+        identify_measurement_types,
+        MeasurementTypeSchema,
+    ),
+    (
+        "4g",
+        "Modality Types",
+        "step4g_modality_types",
+        identify_modality_types,
+        ModalityTypeSchema,
+    ),
+)
+
+
+# Base URL for trace links, normalised once at import
+_TRACE_URL_PREFIX = AGENT_TRACE_BASE_URL.rstrip("/") + "/"
+
+
+# Static part of the overall trace metadata; run_combined_workflow adds per-run values
+_BASE_TRACE_METADATA = {
+    "workflow_name": "Document Analysis",
+    "domain_model": DOMAIN_MODEL,
+    "sub_domain_model": SUB_DOMAIN_MODEL,
+    "topic_model": TOPIC_MODEL,
+    "entity_type_model": ENTITY_TYPE_MODEL,
+    # "ontology_type_model": ONTOLOGY_TYPE_MODEL,
+    "event_type_model": EVENT_TYPE_MODEL,
+    "statement_type_model": STATEMENT_TYPE_MODEL,
+    "evidence_type_model": EVIDENCE_TYPE_MODEL,
+    "measurement_type_model": MEASUREMENT_TYPE_MODEL,
+    # "modality_type_model": MODALITY_TYPE_MODEL,  # Added modality model (4g)
+    "entity_instance_model": ENTITY_INSTANCE_MODEL,
+    # "ontology_instance_model": ONTOLOGY_INSTANCE_MODEL,
+    "event_instance_model": EVENT_INSTANCE_MODEL,
+    "statement_instance_model": STATEMENT_INSTANCE_MODEL,
+    "evidence_instance_model": EVIDENCE_INSTANCE_MODEL,
+    "measurement_instance_model": MEASUREMENT_INSTANCE_MODEL,
+    # "modality_instance_model": MODALITY_INSTANCE_MODEL,
+    "relationship_model": RELATIONSHIP_MODEL,
+    "relationship_instance_model": RELATIONSHIP_INSTANCE_MODEL,
+}
+
+
+@dataclass
+class WorkflowState:
+    """Outputs collected by :func:`run_combined_workflow`; ``None`` means failed or skipped."""
+
+    domain: Optional[DomainResultSchema] = None
+    sub_domains: Any = None
+    topics: Any = None
+    entity_types: Optional[EntityTypeSchema] = None
+    ontology_types: Optional[OntologyTypeSchema] = None
+    event_types: Optional[EventTypeSchema] = None
+    statement_types: Optional[StatementTypeSchema] = None
+    evidence_types: Optional[EvidenceTypeSchema] = None
+    measurement_types: Optional[MeasurementTypeSchema] = None
+    modality_types: Optional[ModalityTypeSchema] = None
+    entity_instances: Any = None
+    ontology_instances: Any = None
+    event_instances: Any = None
+    statement_instances: Any = None
+    evidence_instances: Any = None
+    measurement_instances: Any = None
+    modality_instances: Any = None
+    relationship_types: Any = None
+    relationship_instances: Any = None
+    aggregated_instances: Any = None
+
+
+# Final status log: (WorkflowState field, label, text logged when the field is empty)
+_STEP_STATUS_LINES = (
+    ("domain", "Step 1 (Domain)", "Failed/Skipped"),
+    ("sub_domains", "Step 2 (SubDomain)", "Failed/Skipped"),
+    ("topics", "Step 3 (Topics)", "Failed/Skipped"),
+    ("entity_types", "Step 4a (Entity Types)", "Failed/Skipped/Error"),
+    ("ontology_types", "Step 4b (Ontology Types)", "Failed/Skipped/Error"),
+    ("event_types", "Step 4c (Event Types)", "Failed/Skipped/Error"),
+    ("statement_types", "Step 4d (Statement Types)", "Failed/Skipped/Error"),
+    ("evidence_types", "Step 4e (Evidence Types)", "Failed/Skipped/Error"),
+    ("measurement_types", "Step 4f (Measurement Types)", "Failed/Skipped/Error"),
+    ("modality_types", "Step 4g (Modality Types)", "Failed/Skipped/Error"),
+    ("entity_instances", "Step 5a (Entity Instances)", "Failed/Skipped"),
+    ("ontology_instances", "Step 5b (Ontology Instances)", "Failed/Skipped"),
+    ("event_instances", "Step 5c (Event Instances)", "Failed/Skipped"),
+    ("statement_instances", "Step 5d (Statement Instances)", "Failed/Skipped"),
+    ("evidence_instances", "Step 5e (Evidence Instances)", "Failed/Skipped"),
+    ("measurement_instances", "Step 5f (Measurement Instances)", "Failed/Skipped"),
+    ("modality_instances", "Step 5g (Modality Instances)", "Failed/Skipped"),
+    ("relationship_types", "Step 6 (Relationships)", "Failed/Skipped"),
+    ("relationship_instances", "Step 6b (Relationship Instances)", "Failed/Skipped"),
+    ("aggregated_instances", "Aggregated Instances", "Failed/Skipped"),
+)
+
+
 # --- Main Execution Logic (Combined Workflow in Single Trace) ---
-async def run_combined_workflow(content: str) -> None:
+async def run_combined_workflow(
+    content: str, content_length: Optional[int] = None
+) -> None:
     """Runs domain, sub-domain, topic, entity, ontology, event, statement, evidence,
     measurement, modality, entity, ontology, event, statement, evidence, measurement instance extraction, modality instance extraction, and relationship identification within a single trace.
+
+    ``content_length`` may be passed by callers that already measured ``content``.
     """
     # Skip processing if input content is empty or only whitespace
-    if not content or not content.strip():
+    if not content or content.isspace():
         logger.warning("Input content is empty or whitespace only. Skipping analysis.")
-        print("Input content is empty. No analysis performed.")
         return
 
-    # Initialize variables to store results from each step
+    # Results from each step are collected on a single state object
     overall_trace_id: Optional[str] = None
-    domain_data: Optional[DomainResultSchema] = None
-    sub_domain_data = None
-    topic_data = None
-    entity_data = None
-    ontology_data = None
-    event_data = None
-    statement_data = None
-    evidence_data = None
-    measurement_data = None
-    modality_data = None  # Added variable for new step (4g)
-    instance_data = None
-    ontology_instance_data = None
-    event_instance_data = None
-    statement_instance_data = None
-    evidence_instance_data = None
-    measurement_instance_data = None
-    modality_instance_data = None
-    aggregated_instance_data = None
-    relationship_data = None
-    relationship_instance_data = None
+    state = WorkflowState()
     primary_domain = None
 
     # Generate a group ID to link all step traces
     overall_group_id = gen_trace_id()
 
-    # Metadata for the single overall trace
+    # Metadata for the single overall trace: static model settings plus per-run values
     overall_trace_metadata = {
-        "workflow_name": "Document Analysis",
-        # "input_content_length": str(len(content)),
-        # "start_timestamp_utc": datetime.now(timezone.utc).isoformat(),
-        "domain_model": DOMAIN_MODEL,
-        "sub_domain_model": SUB_DOMAIN_MODEL,
-        "topic_model": TOPIC_MODEL,
-        "entity_type_model": ENTITY_TYPE_MODEL,
-        # "ontology_type_model": ONTOLOGY_TYPE_MODEL,
-        "event_type_model": EVENT_TYPE_MODEL,
-        "statement_type_model": STATEMENT_TYPE_MODEL,
-        "evidence_type_model": EVIDENCE_TYPE_MODEL,
-        "measurement_type_model": MEASUREMENT_TYPE_MODEL,
-        # "modality_type_model": MODALITY_TYPE_MODEL,  # Added modality model (4g)
-        "entity_instance_model": ENTITY_INSTANCE_MODEL,
-        # "ontology_instance_model": ONTOLOGY_INSTANCE_MODEL,
-        "event_instance_model": EVENT_INSTANCE_MODEL,
-        "statement_instance_model": STATEMENT_INSTANCE_MODEL,
-        "evidence_instance_model": EVIDENCE_INSTANCE_MODEL,
-        "measurement_instance_model": MEASUREMENT_INSTANCE_MODEL,
-        # "modality_instance_model": MODALITY_INSTANCE_MODEL,
-        "relationship_model": RELATIONSHIP_MODEL,
-        "relationship_instance_model": RELATIONSHIP_INSTANCE_MODEL,
+        **_BASE_TRACE_METADATA,
+        "input_content_length": str(
+            content_length if content_length is not None else len(content)
+        ),
+        "start_timestamp_utc": datetime.now(timezone.utc).isoformat(),
     }
 
     # Start the overall trace for the entire workflow
     logger.info(
-        f"--- Starting Analysis Workflow Trace ({overall_trace_metadata['workflow_name']}) ---"
+        "--- Starting Analysis Workflow Trace (%s) ---",
+        overall_trace_metadata["workflow_name"],
     )
-    print(f"\n--- Starting Workflow: {overall_trace_metadata['workflow_name']} ---")
 
     try:
         # Use the SDK's trace context manager to wrap the entire workflow
@@ -208,14 +363,12 @@ async def run_combined_workflow(content: str) -> None:
             # Attempt to get the trace ID and construct the URL
             if overall_span and hasattr(overall_span, "trace_id"):
                 overall_trace_id = str(overall_span.trace_id)
-                trace_url = f"{AGENT_TRACE_BASE_URL.rstrip('/')}/{overall_trace_id}"
-                logger.info(f"Overall Workflow Trace URL: {trace_url}")
-                print(f"Overall Workflow Trace URL: {trace_url}")
+                trace_url = f"{_TRACE_URL_PREFIX}{overall_trace_id}"
+                logger.info("Overall Workflow Trace URL: %s", trace_url)
             else:
                 logger.warning(
                     "Could not obtain overall workflow trace ID from context span."
                 )
-                print("Overall Workflow Trace ID not available.")
 
             # === Step 1: Identify Primary Domain (with Confidence) ===
             domain_result = await run_step_with_trace(
@@ -224,9 +377,9 @@ async def run_combined_workflow(content: str) -> None:
                 overall_group_id,
                 content,
             )
-            domain_data, step1_trace_id = domain_result
+            state.domain, step1_trace_id = domain_result
 
-            primary_domain = domain_data.domain.strip() if domain_data else None
+            primary_domain = state.domain.domain.strip() if state.domain else None
 
             # === Step 2: Identify Sub-Domains (with Relevance) ===
             sub_domain_result = (
@@ -240,7 +393,7 @@ async def run_combined_workflow(content: str) -> None:
                 if primary_domain
                 else None
             )
-            sub_domain_data, step2_trace_id = (
+            state.sub_domains, step2_trace_id = (
                 sub_domain_result if sub_domain_result else (None, "")
             )
 
@@ -252,459 +405,154 @@ async def run_combined_workflow(content: str) -> None:
                     overall_group_id,
                     content,
                     primary_domain,
-                    sub_domain_data,
+                    state.sub_domains,
                 )
-                if primary_domain and sub_domain_data
+                if primary_domain and state.sub_domains
                 else None
             )
-            topic_data, step3_trace_id = topic_result if topic_result else (None, "")
+            state.topics, step3_trace_id = topic_result if topic_result else (None, "")
+
+            # Steps 4-6a all need the domain, sub-domains and topics from Steps 1-3
+            context_ready = bool(primary_domain and state.sub_domains and state.topics)
 
             # === Step 4: Parallel Identification (Entities, Ontology, Events, Statements, Evidence, Measurements, Modalities) ===
-            if primary_domain and sub_domain_data and topic_data:
+            if context_ready:
                 logger.info(
                     "--- Starting Step 4: Parallel Identification (Entities, Ontology, Events, Statements, Evidence, Measurements, Modalities) ---"
                 )
-                print("\n--- Starting Step 4: Parallel Identification ---")
                 step4_tasks = [
                     run_step_with_trace(
-                        identify_entity_types,
-                        "step4a_entity_types",
-                        overall_group_id,
-                        content,
-                        primary_domain,
-                        sub_domain_data,
-                        topic_data,
-                    ),
-                    run_step_with_trace(
-                        identify_ontology_types,
-                        "step4b_ontology_types",
-                        overall_group_id,
-                        content,
-                        primary_domain,
-                        sub_domain_data,
-                        topic_data,
-                    ),
-                    run_step_with_trace(
-                        identify_event_types,
-                        "step4c_event_types",
-                        overall_group_id,
-                        content,
-                        primary_domain,
-                        sub_domain_data,
-                        topic_data,
-                    ),
-                    run_step_with_trace(
-                        identify_statement_types,
-                        "step4d_statement_types",
-                        overall_group_id,
-                        content,
-                        primary_domain,
-                        sub_domain_data,
-                        topic_data,
-                    ),
-                    run_step_with_trace(
-                        identify_evidence_types,
-                        "step4e_evidence_types",
-                        overall_group_id,
-                        content,
-                        primary_domain,
-                        sub_domain_data,
-                        topic_data,
-                    ),
-                    run_step_with_trace(
-                        identify_measurement_types,
-                        "step4f_measurement_types",
+                        step_func,
+                        step_name,
                         overall_group_id,
                         content,
                         primary_domain,
-                        sub_domain_data,
-                        topic_data,
-                    ),
-                    run_step_with_trace(
-                        identify_modality_types,
-                        "step4g_modality_types",
-                        overall_group_id,
-                        content,
-                        primary_domain,
-                        sub_domain_data,
-                        topic_data,
-                    ),  # New task (4g)
-                ]
-                # The return type annotation is tricky here because gather returns a list of results OR exceptions
-                # Using List[Any] is simpler for now, specific handling follows
-                step4_results: List[Any] = await asyncio.gather(
-                    *step4_tasks, return_exceptions=True
-                )
-
-                # Process results safely
-                potential_entity_result = step4_results[0]
-                potential_ontology_result = step4_results[1]
-                potential_event_result = step4_results[2]
-                potential_statement_result = step4_results[3]
-                potential_evidence_result = step4_results[4]
-                potential_measurement_result = step4_results[5]
-                potential_modality_result = step4_results[6]  # New result (4g)
-
-                if isinstance(potential_entity_result, Exception):
-                    potential_entity_data = potential_entity_result
-                    step4a_trace_id = ""
-                else:
-                    potential_entity_data, step4a_trace_id = potential_entity_result
-
-                if isinstance(potential_ontology_result, Exception):
-                    potential_ontology_data = potential_ontology_result
-                    step4b_trace_id = ""
-                else:
-                    potential_ontology_data, step4b_trace_id = potential_ontology_result
-
-                if isinstance(potential_event_result, Exception):
-                    potential_event_data = potential_event_result
-                    step4c_trace_id = ""
-                else:
-                    potential_event_data, step4c_trace_id = potential_event_result
-
-                if isinstance(potential_statement_result, Exception):
-                    potential_statement_data = potential_statement_result
-                    step4d_trace_id = ""
-                else:
-                    potential_statement_data, step4d_trace_id = (
-                        potential_statement_result
-                    )
-
-                if isinstance(potential_evidence_result, Exception):
-                    potential_evidence_data = potential_evidence_result
-                    step4e_trace_id = ""
-                else:
-                    potential_evidence_data, step4e_trace_id = potential_evidence_result
-
-                if isinstance(potential_measurement_result, Exception):
-                    potential_measurement_data = potential_measurement_result
-                    step4f_trace_id = ""
-                else:
-                    potential_measurement_data, step4f_trace_id = (
-                        potential_measurement_result
-                    )
-
-                if isinstance(potential_modality_result, Exception):
-                    potential_modality_data = potential_modality_result
-                    step4g_trace_id = ""
-                else:
-                    potential_modality_data, step4g_trace_id = potential_modality_result
-
-                # Entity Data Processing
-                if isinstance(potential_entity_data, Exception):
-                    logger.error(
-                        f"Step 4a (Entity Types) failed with exception: {potential_entity_data}",
-                        exc_info=potential_entity_data,
-                    )
-                    print(
-                        f"Error in Step 4a (Entity Types): {type(potential_entity_data).__name__}: {potential_entity_data}"
-                    )
-                    entity_data = None
-                elif (
-                    isinstance(potential_entity_data, EntityTypeSchema)
-                    or potential_entity_data is None
-                ):
-                    entity_data = potential_entity_data
-                else:
-                    logger.error(
-                        f"Step 4a (Entity Types) returned unexpected type: {type(potential_entity_data)}"
-                    )
-                    entity_data = None
-
-                # Ontology Data Processing
-                if isinstance(potential_ontology_data, Exception):
-                    logger.error(
-                        f"Step 4b (Ontology Types) failed with exception: {potential_ontology_data}",
-                        exc_info=potential_ontology_data,
-                    )
-                    print(
-                        f"Error in Step 4b (Ontology Types): {type(potential_ontology_data).__name__}: {potential_ontology_data}"
-                    )
-                    ontology_data = None
-                elif (
-                    isinstance(potential_ontology_data, OntologyTypeSchema)
-                    or potential_ontology_data is None
-                ):
-                    ontology_data = potential_ontology_data
-                else:
-                    logger.error(
-                        f"Step 4b (Ontology Types) returned unexpected type: {type(potential_ontology_data)}"
-                    )
-                    ontology_data = None
-
-                # Event Data Processing
-                if isinstance(potential_event_data, Exception):
-                    logger.error(
-                        f"Step 4c (Event Types) failed with exception: {potential_event_data}",
-                        exc_info=potential_event_data,
-                    )
-                    print(
-                        f"Error in Step 4c (Event Types): {type(potential_event_data).__name__}: {potential_event_data}"
-                    )
-                    event_data = None
-                elif (
-                    isinstance(potential_event_data, EventTypeSchema)
-                    or potential_event_data is None
-                ):
-                    event_data = potential_event_data
-                else:
-                    logger.error(
-                        f"Step 4c (Event Types) returned unexpected type: {type(potential_event_data)}"
-                    )
-                    event_data = None
-
-                # Statement Data Processing
-                if isinstance(potential_statement_data, Exception):
-                    logger.error(
-                        f"Step 4d (Statement Types) failed with exception: {potential_statement_data}",
-                        exc_info=potential_statement_data,
-                    )
-                    print(
-                        f"Error in Step 4d (Statement Types): {type(potential_statement_data).__name__}: {potential_statement_data}"
-                    )
-                    statement_data = None
-                elif (
-                    isinstance(potential_statement_data, StatementTypeSchema)
-                    or potential_statement_data is None
-                ):
-                    statement_data = potential_statement_data
-                else:
-                    logger.error(
-                        f"Step 4d (Statement Types) returned unexpected type: {type(potential_statement_data)}"
+                        state.sub_domains,
+                        state.topics,
                     )
-                    statement_data = None
-
-                # Evidence Data Processing
-                if isinstance(potential_evidence_data, Exception):
-                    logger.error(
-                        f"Step 4e (Evidence Types) failed with exception: {potential_evidence_data}",
-                        exc_info=potential_evidence_data,
-                    )
-                    print(
-                        f"Error in Step 4e (Evidence Types): {type(potential_evidence_data).__name__}: {potential_evidence_data}"
-                    )
-                    evidence_data = None
-                elif (
-                    isinstance(potential_evidence_data, EvidenceTypeSchema)
-                    or potential_evidence_data is None
-                ):
-                    evidence_data = potential_evidence_data
-                else:
-                    logger.error(
-                        f"Step 4e (Evidence Types) returned unexpected type: {type(potential_evidence_data)}"
-                    )
-                    evidence_data = None
-
-                # Measurement Data Processing
-                if isinstance(potential_measurement_data, Exception):
-                    logger.error(
-                        f"Step 4f (Measurement Types) failed with exception: {potential_measurement_data}",
-                        exc_info=potential_measurement_data,
-                    )
-                    print(
-                        f"Error in Step 4f (Measurement Types): {type(potential_measurement_data).__name__}: {potential_measurement_data}"
-                    )
-                    measurement_data = None
-                elif (
-                    isinstance(potential_measurement_data, MeasurementTypeSchema)
-                    or potential_measurement_data is None
-                ):
-                    measurement_data = potential_measurement_data
-                else:
-                    logger.error(
-                        f"Step 4f (Measurement Types) returned unexpected type: {type(potential_measurement_data)}"
-                    )
-                    measurement_data = None
+                    for _, _, step_name, step_func, _ in _STEP4_SPECS
+                ]
+                # Results OR exceptions come back in order; _validate_step_result sorts them out
+                step4_results = await _run_steps_concurrently(step4_tasks)
 
-                # Modality Data Processing (New Step 4g)
-                if isinstance(potential_modality_data, Exception):
-                    logger.error(
-                        f"Step 4g (Modality Types) failed with exception: {potential_modality_data}",
-                        exc_info=potential_modality_data,
-                    )
-                    print(
-                        f"Error in Step 4g (Modality Types): {type(potential_modality_data).__name__}: {potential_modality_data}"
+                step4_outputs: Dict[str, Any] = {
+                    code: _validate_step_result(step4_result, code, label, schema)
+                    for (code, label, _, _, schema), step4_result in zip(
+                        _STEP4_SPECS, step4_results
                     )
-                    modality_data = None
-                elif (
-                    isinstance(potential_modality_data, ModalityTypeSchema)
-                    or potential_modality_data is None
-                ):
-                    modality_data = potential_modality_data
-                else:
-                    logger.error(
-                        f"Step 4g (Modality Types) returned unexpected type: {type(potential_modality_data)}"
-                    )
-                    modality_data = None
+                }
+                state.entity_types = step4_outputs["4a"]
+                state.ontology_types = step4_outputs["4b"]
+                state.event_types = step4_outputs["4c"]
+                state.statement_types = step4_outputs["4d"]
+                state.evidence_types = step4_outputs["4e"]
+                state.measurement_types = step4_outputs["4f"]
+                state.modality_types = step4_outputs["4g"]
 
                 logger.info("--- Finished Step 4: Parallel Identification ---")
-                print("--- Finished Step 4: Parallel Identification ---")
             else:
                 logger.warning(
                     "Skipping Step 4 (Parallel ID) because prerequisites were not met."
                 )
-                print("Skipping Step 4 (Parallel ID) due to missing prior results.")
 
-            # === Step 5a: Extract Specific Entity Instances ===
-            instance_result = (
-                await run_step_with_trace(
-                    identify_entity_instances,
+            # === Steps 5a-5g + 6a: Instance Extraction and Relationship Types in PARALLEL ===
+            # Each of these steps only depends on Steps 1-3 and its own Step 4 output,
+            # so they are issued together instead of one after another.
+            # Note: Step 6a currently only uses the entity types. If relationships involving other types
+            # were needed, the step would require modification to accept and use that data.
+            step5_specs = [
+                (
+                    "5a",
+                    "Entity Instances",
                     "step5a_entity_instances",
-                    overall_group_id,
-                    content,
-                    primary_domain,
-                    sub_domain_data,
-                    topic_data,
-                    entity_data,
-                )
-                if primary_domain and sub_domain_data and topic_data and entity_data
-                else None
-            )
-            instance_data, step5a_trace_id = (
-                instance_result if instance_result else (None, "")
-            )
-
-            # === Step 5b: Extract Ontology Concept Instances ===
-            ontology_instance_result = (
-                await run_step_with_trace(
-                    identify_ontology_instances,
+                    identify_entity_instances,
+                    state.entity_types,
+                ),
+                (
+                    "5b",
+                    "Ontology Instances",
                     "step5b_ontology_instances",
-                    overall_group_id,
-                    content,
-                    primary_domain,
-                    sub_domain_data,
-                    topic_data,
-                    ontology_data,
-                )
-                if primary_domain and sub_domain_data and topic_data and ontology_data
-                else None
-            )
-            ontology_instance_data, step5b_trace_id = (
-                ontology_instance_result if ontology_instance_result else (None, "")
-            )
-
-            # === Step 5c: Extract Event Instances ===
-            event_instance_result = (
-                await run_step_with_trace(
-                    identify_event_instances,
+                    identify_ontology_instances,
+                    state.ontology_types,
+                ),
+                (
+                    "5c",
+                    "Event Instances",
                     "step5c_event_instances",
-                    overall_group_id,
-                    content,
-                    primary_domain,
-                    sub_domain_data,
-                    topic_data,
-                    event_data,
-                )
-                if primary_domain and sub_domain_data and topic_data and event_data
-                else None
-            )
-            event_instance_data, step5c_trace_id = (
-                event_instance_result if event_instance_result else (None, "")
-            )
-
-            # === Step 5d: Extract Statement Instances ===
-            statement_instance_result = (
-                await run_step_with_trace(
-                    identify_statement_instances,
+                    identify_event_instances,
+                    state.event_types,
+                ),
+                (
+                    "5d",
+                    "Statement Instances",
                     "step5d_statement_instances",
-                    overall_group_id,
-                    content,
-                    primary_domain,
-                    sub_domain_data,
-                    topic_data,
-                    statement_data,
-                )
-                if primary_domain and sub_domain_data and topic_data and statement_data
-                else None
-            )
-            statement_instance_data, step5d_trace_id = (
-                statement_instance_result if statement_instance_result else (None, "")
-            )
-
-            # === Step 5e: Extract Evidence Instances ===
-            evidence_instance_result = (
-                await run_step_with_trace(
-                    identify_evidence_instances,
+                    identify_statement_instances,
+                    state.statement_types,
+                ),
+                (
+                    "5e",
+                    "Evidence Instances",
                     "step5e_evidence_instances",
-                    overall_group_id,
-                    content,
-                    primary_domain,
-                    sub_domain_data,
-                    topic_data,
-                    evidence_data,
-                )
-                if primary_domain and sub_domain_data and topic_data and evidence_data
-                else None
-            )
-            evidence_instance_data, step5e_trace_id = (
-                evidence_instance_result if evidence_instance_result else (None, "")
-            )
-
-            # === Step 5f: Extract Measurement Instances ===
-            measurement_instance_result = (
-                await run_step_with_trace(
-                    identify_measurement_instances,
+                    identify_evidence_instances,
+                    state.evidence_types,
+                ),
+                (
+                    "5f",
+                    "Measurement Instances",
                     "step5f_measurement_instances",
-                    overall_group_id,
-                    content,
-                    primary_domain,
-                    sub_domain_data,
-                    topic_data,
-                    measurement_data,
-                )
-                if primary_domain
-                and sub_domain_data
-                and topic_data
-                and measurement_data
-                else None
-            )
-            measurement_instance_data, step5f_trace_id = (
-                measurement_instance_result
-                if measurement_instance_result
-                else (None, "")
-            )
-
-            # === Step 5g: Extract Modality Instances ===
-            modality_instance_result = (
-                await run_step_with_trace(
-                    identify_modality_instances,
+                    identify_measurement_instances,
+                    state.measurement_types,
+                ),
+                (
+                    "5g",
+                    "Modality Instances",
                     "step5g_modality_instances",
-                    overall_group_id,
-                    content,
-                    primary_domain,
-                    sub_domain_data,
-                    topic_data,
-                    modality_data,
-                )
-                if primary_domain and sub_domain_data and topic_data and modality_data
-                else None
-            )
-            modality_instance_data, step5g_trace_id = (
-                modality_instance_result if modality_instance_result else (None, "")
-            )
-
-            # === Step 6: Identify Relationships in PARALLEL for each Entity Type (Based on Context) ===
-            # Note: This step currently only uses entity_data. If relationships involving other types were needed,
-            # the step would require modification to accept and use that data.
-            relationship_result = (
-                await run_step_with_trace(
-                    identify_relationship_types,
+                    identify_modality_instances,
+                    state.modality_types,
+                ),
+                (
+                    "6a",
+                    "Relationship Types",
                     "step6a_relationship_types",
-                    overall_group_id,
-                    content,
-                    primary_domain,
-                    sub_domain_data,
-                    topic_data,
-                    entity_data,
-                )
-                if primary_domain and sub_domain_data and topic_data and entity_data
-                else None
-            )
-            relationship_data, step6a_trace_id = (
-                relationship_result if relationship_result else (None, "")
+                    identify_relationship_types,
+                    state.entity_types,
+                ),
+            ]
+            step5_scheduled = []
+            step5_tasks = []
+            for code, label, step_name, step_func, type_data in step5_specs:
+                if context_ready and type_data:
+                    step5_scheduled.append((code, label))
+                    step5_tasks.append(
+                        run_step_with_trace(
+                            step_func,
+                            step_name,
+                            overall_group_id,
+                            content,
+                            primary_domain,
+                            state.sub_domains,
+                            state.topics,
+                            type_data,
+                        )
+                    )
+            step5_results: List[Any] = await asyncio.gather(
+                *step5_tasks, return_exceptions=True
             )
 
+            step5_outputs: Dict[str, Any] = {
+                code: _validate_step_result(step5_result, code, label)
+                for (code, label), step5_result in zip(step5_scheduled, step5_results)
+            }
+
+            state.entity_instances = step5_outputs.get("5a")
+            state.ontology_instances = step5_outputs.get("5b")
+            state.event_instances = step5_outputs.get("5c")
+            state.statement_instances = step5_outputs.get("5d")
+            state.evidence_instances = step5_outputs.get("5e")
+            state.measurement_instances = step5_outputs.get("5f")
+            state.modality_instances = step5_outputs.get("5g")
+            state.relationship_types = step5_outputs.get("6a")
+
             relationship_instance_result = (
                 await run_step_with_trace(
                     identify_relationship_instances,
@@ -712,13 +560,13 @@ async def run_combined_workflow(content: str) -> None:
                     overall_group_id,
                     content,
                     primary_domain,
-                    sub_domain_data,
-                    relationship_data,
+                    state.sub_domains,
+                    state.relationship_types,
                 )
-                if primary_domain and sub_domain_data and relationship_data
+                if primary_domain and state.sub_domains and state.relationship_types
                 else None
             )
-            relationship_instance_data, step6b_trace_id = (
+            state.relationship_instances, step6b_trace_id = (
                 relationship_instance_result
                 if relationship_instance_result
                 else (None, "")
@@ -730,92 +578,40 @@ async def run_combined_workflow(content: str) -> None:
                 "step6c_aggregate_instances",
                 overall_group_id,
                 primary_domain,
-                sub_domain_data,
-                instance_data,
-                ontology_instance_data,
-                event_instance_data,
-                statement_instance_data,
-                evidence_instance_data,
-                measurement_instance_data,
-                modality_instance_data,
-                relationship_instance_data,
-            )
-            aggregated_instance_data = agg_result
+                state.sub_domains,
+                state.entity_instances,
+                state.ontology_instances,
+                state.event_instances,
+                state.statement_instances,
+                state.evidence_instances,
+                state.measurement_instances,
+                state.modality_instances,
+                state.relationship_instances,
+            )
+            state.aggregated_instances = agg_result
 
             # Log completion status of individual steps (optional)
-            logger.info(
-                f"Step 1 (Domain) Result: {'Success' if domain_data else 'Failed/Skipped'}"
-            )
-            logger.info(
-                f"Step 2 (SubDomain) Result: {'Success' if sub_domain_data else 'Failed/Skipped'}"
-            )
-            logger.info(
-                f"Step 3 (Topics) Result: {'Success' if topic_data else 'Failed/Skipped'}"
-            )
-            logger.info(
-                f"Step 4a (Entity Types) Result: {'Success' if entity_data else 'Failed/Skipped/Error'}"
-            )
-            logger.info(
-                f"Step 4b (Ontology Types) Result: {'Success' if ontology_data else 'Failed/Skipped/Error'}"
-            )
-            logger.info(
-                f"Step 4c (Event Types) Result: {'Success' if event_data else 'Failed/Skipped/Error'}"
-            )
-            logger.info(
-                f"Step 4d (Statement Types) Result: {'Success' if statement_data else 'Failed/Skipped/Error'}"
-            )
-            logger.info(
-                f"Step 4e (Evidence Types) Result: {'Success' if evidence_data else 'Failed/Skipped/Error'}"
-            )
-            logger.info(
-                f"Step 4f (Measurement Types) Result: {'Success' if measurement_data else 'Failed/Skipped/Error'}"
-            )
-            logger.info(
-                f"Step 4g (Modality Types) Result: {'Success' if modality_data else 'Failed/Skipped/Error'}"
-            )  # Added log for new step (4g)
-            logger.info(
-                f"Step 5a (Entity Instances) Result: {'Success' if instance_data else 'Failed/Skipped'}"
-            )
-            logger.info(
-                f"Step 5b (Ontology Instances) Result: {'Success' if ontology_instance_data else 'Failed/Skipped'}"
-            )
-            logger.info(
-                f"Step 5c (Event Instances) Result: {'Success' if event_instance_data else 'Failed/Skipped'}"
-            )
-            logger.info(
-                f"Step 5d (Statement Instances) Result: {'Success' if statement_instance_data else 'Failed/Skipped'}"
-            )
-            logger.info(
-                f"Step 5e (Evidence Instances) Result: {'Success' if evidence_instance_data else 'Failed/Skipped'}"
-            )
-            logger.info(
-                f"Step 5f (Measurement Instances) Result: {'Success' if measurement_instance_data else 'Failed/Skipped'}"
-            )
-            logger.info(
-                f"Step 5g (Modality Instances) Result: {'Success' if modality_instance_data else 'Failed/Skipped'}"
-            )
-            logger.info(
-                f"Step 6 (Relationships) Result: {'Success' if relationship_data else 'Failed/Skipped'}"
-            )
-            logger.info(
-                f"Step 6b (Relationship Instances) Result: {'Success' if relationship_instance_data else 'Failed/Skipped'}"
-            )
-            logger.info(
-                f"Aggregated Instances Result: {'Success' if aggregated_instance_data else 'Failed/Skipped'}"
-            )
+            if logger.isEnabledFor(logging.INFO):
+                for field_name, label, failure_text in _STEP_STATUS_LINES:
+                    logger.info(
+                        "%s Result: %s",
+                        label,
+                        "Success" if getattr(state, field_name) else failure_text,
+                    )
 
-    except Exception as e:
+    except Exception:
         # Catch errors occurring outside the specific steps but within the trace
         logger.exception(
             "An unexpected error occurred within the main workflow trace.",
             extra={"trace_id": overall_trace_id or "N/A"},
         )
-        print(
-            f"\nAn unexpected error occurred during the main workflow: {type(e).__name__}: {e}"
-        )
+    finally:
+        # Release the wrapped copies of this document held by the prompt helper
+        full_text_block.cache_clear()
 
-    # This message prints regardless of success/failure within the trace
-    print(f"\nFull Workflow ({overall_trace_metadata['workflow_name']}) finished.")
+    # This message is logged regardless of success/failure within the trace
     logger.info(
-        f"--- Finished Analysis Workflow Trace ({overall_trace_metadata['workflow_name']}) (ID: {overall_trace_id or 'N/A'}) ---"
+        "--- Finished Analysis Workflow Trace (%s) (ID: %s) ---",
+        overall_trace_metadata["workflow_name"],
+        overall_trace_id or "N/A",
     )
@@ -1,13 +1,35 @@
 from __future__ import annotations
 
-from typing import List, Optional
-from pydantic import BaseModel, Field
+from typing import Any, List, Optional
+
+from typing_extensions import Self
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class _SchemaModel(BaseModel):
+    """Base for all workflow schemas.
+
+    Validators and JSON schemas are built on first use rather than at import,
+    so importing the package does not pay for every model up front.
+    """
+
+    model_config = ConfigDict(defer_build=True)
+
+    @classmethod
+    def trusted(cls, **data: Any) -> Self:
+        """Builds an instance from already-validated values without re-validating.
+
+        Only use this when assembling results from schema instances that were
+        validated when the agent output arrived.
+        """
+        return cls.model_construct(**data)
+
 
 # --- Schemas for Existing Agents (1-3) ---
 
 
 # Schema for the primary domain identifier
-class DomainSchema(BaseModel):
+class DomainSchema(_SchemaModel):
     """Schema containing only the identified domain."""
 
     domain: str = Field(
@@ -37,7 +59,7 @@ class DomainResultSchema(DomainSchema):
 
 
 # Simple schema used when only a confidence score is needed
-class ConfidenceScoreSchema(BaseModel):
+class ConfidenceScoreSchema(_SchemaModel):
     """Represents just a confidence score for a prior analysis."""
 
     confidence_score: float = Field(
@@ -46,7 +68,7 @@ class ConfidenceScoreSchema(BaseModel):
 
 
 # Simple schema used when only a relevance score is needed
-class RelevanceScoreSchema(BaseModel):
+class RelevanceScoreSchema(_SchemaModel):
     """Represents just a relevance score for a particular item."""
 
     relevance_score: float = Field(
@@ -58,7 +80,7 @@ class RelevanceScoreSchema(BaseModel):
 
 
 # Simple schema used when only a clarity score is needed
-class ClarityScoreSchema(BaseModel):
+class ClarityScoreSchema(_SchemaModel):
     """Represents how clear a provided item is."""
 
     clarity_score: float = Field(
@@ -69,7 +91,7 @@ class ClarityScoreSchema(BaseModel):
 # --- New Schemas for Step 2 Identifier Output ---
 
 
-class SubDomainIdentifierDetail(BaseModel):
+class SubDomainIdentifierDetail(_SchemaModel):
     """Represents a single identified sub-domain without scores."""
 
     sub_domain: str = Field(
@@ -77,7 +99,7 @@ class SubDomainIdentifierDetail(BaseModel):
     )
 
 
-class SubDomainIdentifierSchema(BaseModel):
+class SubDomainIdentifierSchema(_SchemaModel):
     """Schema defining the unscored sub-domain identification output."""
 
     primary_domain: str = Field(
@@ -95,7 +117,7 @@ class SubDomainIdentifierSchema(BaseModel):
 
 
 # Nested schema for a sub-domain
-class SubDomainDetail(BaseModel):
+class SubDomainDetail(_SchemaModel):
     """Represents a single identified sub-domain."""
 
     sub_domain: str = Field(
@@ -116,7 +138,7 @@ class SubDomainDetail(BaseModel):
 
 
 # Schema for sub-domain analysis output (Agent 2)
-class SubDomainSchema(BaseModel):
+class SubDomainSchema(_SchemaModel):
     """Schema defining the expected output for sub-domain analysis."""
 
     primary_domain: str = Field(
@@ -133,13 +155,13 @@ class SubDomainSchema(BaseModel):
 # --- New Schemas for Step 3 Topic Identifier Output ---
 
 
-class TopicIdentifierDetail(BaseModel):
+class TopicIdentifierDetail(_SchemaModel):
     """Represents a single identified topic without scores."""
 
     topic: str = Field(description="The specific topic identified within the text.")
 
 
-class SingleSubDomainTopicIdentifierSchema(BaseModel):
+class SingleSubDomainTopicIdentifierSchema(_SchemaModel):
     """Schema defining unscored topic identification for one sub-domain."""
 
     sub_domain: str = Field(description="The sub-domain being analyzed.")
@@ -148,8 +170,17 @@ class SingleSubDomainTopicIdentifierSchema(BaseModel):
     )
 
 
+# Schema for a batched topic identification call covering several sub-domains (Agent 3, batched)
+class TopicBatchIdentifierSchema(_SchemaModel):
+    """Schema for topics identified for several sub-domains in one call."""
+
+    results: List[SingleSubDomainTopicIdentifierSchema] = Field(
+        description="One entry per requested sub-domain, each listing the topics identified for that sub-domain."
+    )
+
+
 # Nested schema for a topic
-class TopicDetail(BaseModel):
+class TopicDetail(_SchemaModel):
     """Represents a single identified topic."""
 
     topic: str = Field(description="The specific topic identified within the text.")
@@ -168,7 +199,7 @@ class TopicDetail(BaseModel):
 
 
 # Schema for the output of the *single* topic identification agent call (Agent 3)
-class SingleSubDomainTopicSchema(BaseModel):
+class SingleSubDomainTopicSchema(_SchemaModel):
     """Represents topics identified for a single sub-domain."""
 
     sub_domain: str = Field(description="The sub-domain being analyzed.")
@@ -178,7 +209,7 @@ class SingleSubDomainTopicSchema(BaseModel):
 
 
 # Schema for the final, aggregated topic output (used for saving)
-class TopicSchema(BaseModel):
+class TopicSchema(_SchemaModel):
     """Schema defining the final aggregated output for topic identification analysis."""
 
     primary_domain: str = Field(description="The overall primary domain provided.")
@@ -195,7 +226,7 @@ class TopicSchema(BaseModel):
 
 
 # Per sub-domain result schema used during Step 4 processing
-class SingleSubDomainEntityTypeSchema(BaseModel):
+class SingleSubDomainEntityTypeSchema(_SchemaModel):
     """Entity types identified for one sub-domain."""
 
     sub_domain: str = Field(description="The sub-domain these entity types relate to.")
@@ -211,7 +242,7 @@ class SingleSubDomainEntityTypeSchema(BaseModel):
     )
 
 
-class SingleSubDomainOntologyTypeSchema(BaseModel):
+class SingleSubDomainOntologyTypeSchema(_SchemaModel):
     """Ontology types identified for one sub-domain."""
 
     sub_domain: str = Field(
@@ -229,7 +260,7 @@ class SingleSubDomainOntologyTypeSchema(BaseModel):
     )
 
 
-class SingleSubDomainEventTypeSchema(BaseModel):
+class SingleSubDomainEventTypeSchema(_SchemaModel):
     """Event types identified for one sub-domain."""
 
     sub_domain: str = Field(description="The sub-domain these event types relate to.")
@@ -245,7 +276,7 @@ class SingleSubDomainEventTypeSchema(BaseModel):
     )
 
 
-class SingleSubDomainStatementTypeSchema(BaseModel):
+class SingleSubDomainStatementTypeSchema(_SchemaModel):
     """Statement types identified for one sub-domain."""
 
     sub_domain: str = Field(
@@ -263,7 +294,7 @@ class SingleSubDomainStatementTypeSchema(BaseModel):
     )
 
 
-class SingleSubDomainEvidenceTypeSchema(BaseModel):
+class SingleSubDomainEvidenceTypeSchema(_SchemaModel):
     """Evidence types identified for one sub-domain."""
 
     sub_domain: str = Field(
@@ -281,7 +312,7 @@ class SingleSubDomainEvidenceTypeSchema(BaseModel):
     )
 
 
-class SingleSubDomainMeasurementTypeSchema(BaseModel):
+class SingleSubDomainMeasurementTypeSchema(_SchemaModel):
     """Measurement types identified for one sub-domain."""
 
     sub_domain: str = Field(
@@ -299,7 +330,7 @@ class SingleSubDomainMeasurementTypeSchema(BaseModel):
     )
 
 
-class SingleSubDomainModalityTypeSchema(BaseModel):
+class SingleSubDomainModalityTypeSchema(_SchemaModel):
     """Modality types identified for one sub-domain."""
 
     sub_domain: str = Field(
@@ -321,7 +352,7 @@ class SingleSubDomainModalityTypeSchema(BaseModel):
 
 
 # Nested schema for an entity type (Agent 4a)
-class EntityTypeDetail(BaseModel):
+class EntityTypeDetail(_SchemaModel):
     """Represents an entity type with optional scoring information."""
 
     entity_type: str = Field(
@@ -345,7 +376,7 @@ class EntityTypeDetail(BaseModel):
 
 
 # Schema for entity type analysis output (Agent 4a)
-class EntityTypeSchema(BaseModel):
+class EntityTypeSchema(_SchemaModel):
     """Schema defining the expected output for entity type analysis (Step 4a)."""
 
     primary_domain: str = Field(
@@ -368,7 +399,7 @@ class EntityTypeSchema(BaseModel):
 
 
 # Nested schema for an ontology type/concept (Agent 4b)
-class OntologyTypeDetail(BaseModel):
+class OntologyTypeDetail(_SchemaModel):
     """Represents an ontology type or concept with optional scoring information."""
 
     ontology_type: str = Field(
@@ -391,7 +422,7 @@ class OntologyTypeDetail(BaseModel):
 
 
 # Schema for ontology type analysis output (Agent 4b)
-class OntologyTypeSchema(BaseModel):
+class OntologyTypeSchema(_SchemaModel):
     """Schema defining the expected output for ontology type analysis (Step 4b)."""
 
     primary_domain: str = Field(
@@ -414,7 +445,7 @@ class OntologyTypeSchema(BaseModel):
 
 
 # Nested schema for an event type (Agent 4c)
-class EventDetail(BaseModel):
+class EventDetail(_SchemaModel):
     """Represents an identified event type with optional scoring information."""
 
     event_type: str = Field(
@@ -439,7 +470,7 @@ class EventDetail(BaseModel):
 
 
 # Schema for event type analysis output (Agent 4c)
-class EventTypeSchema(BaseModel):
+class EventTypeSchema(_SchemaModel):
     """Schema defining the expected output for event type analysis (Step 4c)."""
 
     primary_domain: str = Field(
@@ -462,7 +493,7 @@ class EventTypeSchema(BaseModel):
 
 
 # Nested schema for a statement type (Agent 4d)
-class StatementDetail(BaseModel):
+class StatementDetail(_SchemaModel):
     """Represents an identified statement type with optional scoring information."""
 
     statement_type: str = Field(
@@ -487,7 +518,7 @@ class StatementDetail(BaseModel):
 
 
 # Schema for statement type analysis output (Agent 4d)
-class StatementTypeSchema(BaseModel):
+class StatementTypeSchema(_SchemaModel):
     """Schema defining the expected output for statement type analysis (Step 4d)."""
 
     primary_domain: str = Field(
@@ -510,7 +541,7 @@ class StatementTypeSchema(BaseModel):
 
 
 # Nested schema for an evidence type (Agent 4e)
-class EvidenceDetail(BaseModel):
+class EvidenceDetail(_SchemaModel):
     """Represents an identified evidence type with optional scoring information."""
 
     evidence_type: str = Field(
@@ -533,7 +564,7 @@ class EvidenceDetail(BaseModel):
 
 
 # Schema for evidence type analysis output (Agent 4e)
-class EvidenceTypeSchema(BaseModel):
+class EvidenceTypeSchema(_SchemaModel):
     """Schema defining the expected output for evidence type analysis (Step 4e)."""
 
     primary_domain: str = Field(
@@ -556,7 +587,7 @@ class EvidenceTypeSchema(BaseModel):
 
 
 # Nested schema for a measurement type (Agent 4f)
-class MeasurementDetail(BaseModel):
+class MeasurementDetail(_SchemaModel):
     """Represents an identified measurement type with optional scoring information."""
 
     measurement_type: str = Field(
@@ -582,7 +613,7 @@ class MeasurementDetail(BaseModel):
 
 
 # Schema for measurement type analysis output (Agent 4f)
-class MeasurementTypeSchema(BaseModel):
+class MeasurementTypeSchema(_SchemaModel):
     """Schema defining the expected output for measurement type analysis (Step 4f)."""
 
     primary_domain: str = Field(
@@ -605,7 +636,7 @@ class MeasurementTypeSchema(BaseModel):
 
 
 # Nested schema for a modality type (Agent 4g - NEW)
-class ModalityDetail(BaseModel):
+class ModalityDetail(_SchemaModel):
     """Represents an identified modality type with optional scoring information."""
 
     modality_type: str = Field(
@@ -630,7 +661,7 @@ class ModalityDetail(BaseModel):
 
 
 # Schema for modality type analysis output (Agent 4g - NEW)
-class ModalityTypeSchema(BaseModel):
+class ModalityTypeSchema(_SchemaModel):
     """Schema defining the expected output for modality type analysis (Step 4g)."""
 
     primary_domain: str = Field(
@@ -655,7 +686,7 @@ class ModalityTypeSchema(BaseModel):
 # --- Schema for Step 5a: Entity Instance Extraction ---
 
 
-class EntityInstanceDetail(BaseModel):
+class EntityInstanceDetail(_SchemaModel):
     """Represents a specific entity mention extracted from the text."""
 
     entity_type: str = Field(
@@ -684,7 +715,7 @@ class EntityInstanceDetail(BaseModel):
     )
 
 
-class EntityInstanceSchema(BaseModel):
+class EntityInstanceSchema(_SchemaModel):
     """Schema defining extracted entity instances within the document."""
 
     primary_domain: str = Field(
@@ -707,7 +738,7 @@ class EntityInstanceSchema(BaseModel):
 # --- Schema for Step 5b: Ontology Instance Extraction ---
 
 
-class OntologyInstanceDetail(BaseModel):
+class OntologyInstanceDetail(_SchemaModel):
     """Represents a specific ontology concept mention extracted from the text."""
 
     ontology_type: str = Field(
@@ -736,7 +767,7 @@ class OntologyInstanceDetail(BaseModel):
     )
 
 
-class OntologyInstanceSchema(BaseModel):
+class OntologyInstanceSchema(_SchemaModel):
     """Schema defining extracted ontology instances within the document."""
 
     primary_domain: str = Field(
@@ -760,7 +791,7 @@ class OntologyInstanceSchema(BaseModel):
 # --- Schema for Step 5c: Event Instance Extraction ---
 
 
-class EventInstanceDetail(BaseModel):
+class EventInstanceDetail(_SchemaModel):
     """Represents a specific event mention extracted from the text."""
 
     event_type: str = Field(
@@ -789,7 +820,7 @@ class EventInstanceDetail(BaseModel):
     )
 
 
-class EventInstanceSchema(BaseModel):
+class EventInstanceSchema(_SchemaModel):
     """Schema defining extracted event instances within the document."""
 
     primary_domain: str = Field(
@@ -812,7 +843,7 @@ class EventInstanceSchema(BaseModel):
 # --- Schema for Step 5d: Statement Instance Extraction ---
 
 
-class StatementInstanceDetail(BaseModel):
+class StatementInstanceDetail(_SchemaModel):
     """Represents a specific statement mention extracted from the text."""
 
     statement_type: str = Field(
@@ -843,7 +874,7 @@ class StatementInstanceDetail(BaseModel):
     )
 
 
-class StatementInstanceSchema(BaseModel):
+class StatementInstanceSchema(_SchemaModel):
     """Schema defining extracted statement instances within the document."""
 
     primary_domain: str = Field(
@@ -867,7 +898,7 @@ class StatementInstanceSchema(BaseModel):
 # --- Schema for Step 5e: Evidence Instance Extraction ---
 
 
-class EvidenceInstanceDetail(BaseModel):
+class EvidenceInstanceDetail(_SchemaModel):
     """Represents a specific evidence mention extracted from the text."""
 
     evidence_type: str = Field(
@@ -896,7 +927,7 @@ class EvidenceInstanceDetail(BaseModel):
     )
 
 
-class EvidenceInstanceSchema(BaseModel):
+class EvidenceInstanceSchema(_SchemaModel):
     """Schema defining extracted evidence instances within the document."""
 
     primary_domain: str = Field(
@@ -920,7 +951,7 @@ class EvidenceInstanceSchema(BaseModel):
 # --- Schema for Step 5f: Measurement Instance Extraction ---
 
 
-class MeasurementInstanceDetail(BaseModel):
+class MeasurementInstanceDetail(_SchemaModel):
     """Represents a specific measurement mention extracted from the text."""
 
     measurement_type: str = Field(
@@ -949,7 +980,7 @@ class MeasurementInstanceDetail(BaseModel):
     )
 
 
-class MeasurementInstanceSchema(BaseModel):
+class MeasurementInstanceSchema(_SchemaModel):
     """Schema defining extracted measurement instances within the document."""
 
     primary_domain: str = Field(
@@ -973,7 +1004,7 @@ class MeasurementInstanceSchema(BaseModel):
 # --- Schema for Step 5g: Modality Instance Extraction ---
 
 
-class ModalityInstanceDetail(BaseModel):
+class ModalityInstanceDetail(_SchemaModel):
     """Represents a specific modality mention extracted from the text."""
 
     modality_type: str = Field(
@@ -1004,7 +1035,7 @@ class ModalityInstanceDetail(BaseModel):
     )
 
 
-class ModalityInstanceSchema(BaseModel):
+class ModalityInstanceSchema(_SchemaModel):
     """Schema defining extracted modality instances within the document."""
 
     primary_domain: str = Field(
@@ -1029,7 +1060,7 @@ class ModalityInstanceSchema(BaseModel):
 
 
 # Nested schema for a specific identified relationship between entities
-class RelationshipDetail(BaseModel):
+class RelationshipDetail(_SchemaModel):
     """Represents a single identified relationship between two entities with optional scoring information."""
 
     relationship_type: str = Field(
@@ -1052,7 +1083,7 @@ class RelationshipDetail(BaseModel):
 
 
 # Schema for the output of a *single* relationship identification agent call (Agent 5 - one call per entity type focus)
-class SingleEntityTypeRelationshipSchema(BaseModel):
+class SingleEntityTypeRelationshipSchema(_SchemaModel):
     """Represents relationships identified focusing on a single entity type within the broader context."""
 
     entity_type_focus: str = Field(
@@ -1064,7 +1095,7 @@ class SingleEntityTypeRelationshipSchema(BaseModel):
 
 
 # Schema for the final, aggregated relationship output (used for saving Step 5 results)
-class RelationshipSchema(BaseModel):
+class RelationshipSchema(_SchemaModel):
     """Schema defining the final aggregated output for relationship identification analysis."""
 
     primary_domain: str = Field(
@@ -1087,7 +1118,7 @@ class RelationshipSchema(BaseModel):
 
 
 # --- Schema for Step 6: Relationship Instance Extraction ---
-class RelationshipInstanceDetail(BaseModel):
+class RelationshipInstanceDetail(_SchemaModel):
     """Represents a specific relationship instance between two entities.
 
     Optional scoring fields ``confidence_score``, ``relevance_score`` and
@@ -1118,7 +1149,7 @@ class RelationshipInstanceDetail(BaseModel):
     )
 
 
-class RelationshipInstanceSchema(BaseModel):
+class RelationshipInstanceSchema(_SchemaModel):
     """Schema defining extracted relationship instances within the document."""
 
     primary_domain: str = Field(
@@ -1137,7 +1168,7 @@ class RelationshipInstanceSchema(BaseModel):
 
 
 # --- Aggregated Extracted Instances Schema ---
-class ExtractedInstancesSchema(BaseModel):
+class ExtractedInstancesSchema(_SchemaModel):
     """Aggregates all instance extraction outputs from Steps 5a-5g."""
 
     primary_domain: str = Field(
@@ -1,28 +1,59 @@
-"""Agent workflow step modules for the Graphyte workflow."""
-
-from .step1_domain import identify_domain
-from .step2_subdomains import identify_subdomains
-from .step3_topics import identify_topics
-from .step4a_entity_types import identify_entity_types
-from .step4b_ontology_types import identify_ontology_types
-from .step4c_event_types import identify_event_types
-from .step4d_statement_types import identify_statement_types
-from .step4e_evidence_types import identify_evidence_types
-from .step4f_measurement_types import identify_measurement_types
-from .step4g_modality_types import (
-    identify_modality_types,
-)  # Added import for new step (4g)
-from .step5a_entity_instances import identify_entity_instances
-from .step5b_ontology_instances import identify_ontology_instances
-from .step5c_event_instances import identify_event_instances
-from .step5d_statement_instances import identify_statement_instances
-from .step5e_evidence_instances import identify_evidence_instances
-from .step5f_measurement_instances import identify_measurement_instances
-from .step5g_modality_instances import identify_modality_instances
-from .step6c_aggregate_instances import aggregate_extracted_instances
-from .step6a_relationship_types import identify_relationship_types
-from .step6b_relationship_instances import identify_relationship_instances
-from .visualization import generate_workflow_visualization
+"""Agent workflow step modules for the Graphyte workflow.
+
+Step functions are imported lazily on first attribute access (PEP 562), so
+importing this package does not load every step module and its schemas.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .step1_domain import identify_domain
+    from .step2_subdomains import identify_subdomains
+    from .step3_topics import identify_topics
+    from .step4a_entity_types import identify_entity_types
+    from .step4b_ontology_types import identify_ontology_types
+    from .step4c_event_types import identify_event_types
+    from .step4d_statement_types import identify_statement_types
+    from .step4e_evidence_types import identify_evidence_types
+    from .step4f_measurement_types import identify_measurement_types
+    from .step4g_modality_types import identify_modality_types
+    from .step5a_entity_instances import identify_entity_instances
+    from .step5b_ontology_instances import identify_ontology_instances
+    from .step5c_event_instances import identify_event_instances
+    from .step5d_statement_instances import identify_statement_instances
+    from .step5e_evidence_instances import identify_evidence_instances
+    from .step5f_measurement_instances import identify_measurement_instances
+    from .step5g_modality_instances import identify_modality_instances
+    from .step6c_aggregate_instances import aggregate_extracted_instances
+    from .step6a_relationship_types import identify_relationship_types
+    from .step6b_relationship_instances import identify_relationship_instances
+    from .visualization import generate_workflow_visualization
+
+# Exported name -> submodule that defines it
+_LAZY_IMPORTS = {
+    "identify_domain": "step1_domain",
+    "identify_subdomains": "step2_subdomains",
+    "identify_topics": "step3_topics",
+    "identify_entity_types": "step4a_entity_types",
+    "identify_ontology_types": "step4b_ontology_types",
+    "identify_event_types": "step4c_event_types",
+    "identify_statement_types": "step4d_statement_types",
+    "identify_evidence_types": "step4e_evidence_types",
+    "identify_measurement_types": "step4f_measurement_types",
+    "identify_modality_types": "step4g_modality_types",
+    "identify_entity_instances": "step5a_entity_instances",
+    "identify_ontology_instances": "step5b_ontology_instances",
+    "identify_event_instances": "step5c_event_instances",
+    "identify_statement_instances": "step5d_statement_instances",
+    "identify_evidence_instances": "step5e_evidence_instances",
+    "identify_measurement_instances": "step5f_measurement_instances",
+    "identify_modality_instances": "step5g_modality_instances",
+    "aggregate_extracted_instances": "step6c_aggregate_instances",
+    "identify_relationship_types": "step6a_relationship_types",
+    "identify_relationship_instances": "step6b_relationship_instances",
+    "generate_workflow_visualization": "visualization",
+}
 
 __all__ = [
     "identify_domain",
@@ -47,3 +78,17 @@ __all__ = [
     "identify_relationship_instances",
     "generate_workflow_visualization",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name = _LAZY_IMPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(f".{module_name}", __name__), name)
+    globals()[name] = value  # Cache so later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
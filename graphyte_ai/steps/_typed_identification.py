@@ -0,0 +1,370 @@
+"""Shared implementation of the type identification steps (Steps 4d and 4e)."""
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Protocol,
+    Type,
+    TypeVar,
+)
+
+from typing_extensions import Self
+from pydantic import ValidationError
+
+from agents import RunConfig, TResponseInputItem  # type: ignore[attr-defined]
+
+from ..config import (
+    SAVE_INTERMEDIATE_OUTPUTS,
+    TYPE_ID_MAX_PROMPT_CHARS,
+    VERBOSE_OUTPUT,
+)
+from ..schemas import SubDomainSchema, TopicSchema
+from ..utils import (
+    cached_run_agent_with_retry,
+    direct_save_json_output,
+    full_text_block,
+    head_tail_excerpt,
+)
+
+
+class TypeIdentificationSchema(Protocol):
+    """What the shared steps use from an output schema such as StatementTypeSchema."""
+
+    primary_domain: str
+    analyzed_sub_domains: List[str]
+
+    @classmethod
+    def model_validate(cls, obj: Any) -> Self: ...
+
+    def model_dump(self) -> Dict[str, Any]: ...
+
+    def model_dump_json(self, *, indent: Optional[int] = None) -> str: ...
+
+
+SchemaT = TypeVar("SchemaT", bound=TypeIdentificationSchema)
+
+# Instruction message for the type identifier agents; only the step-specific
+# names and the context summary are filled in per call
+type_identification_prompt_template = (
+    "Analyze the following text to identify key {kind_upper} types (e.g., {examples}). "
+    "Use the provided context:\n{context}\n\n"
+    "Identify {kind} types relevant to this overall context. "
+    "Output ONLY using the required {schema_name}, including the primary_domain and analyzed_sub_domains list in the output."
+)
+
+
+async def run_typed_identification(
+    content: str,
+    primary_domain: str,
+    sub_domain_data: SubDomainSchema,
+    topic_data: TopicSchema,
+    trace_id: Optional[str],
+    group_id: Optional[str],
+    *,
+    step: str,
+    kind: str,
+    examples: str,
+    agent: Any,
+    schema_cls: Type[SchemaT],
+    model: str,
+    output_dir: Path,
+    output_filename: str,
+    items_attr: str,
+    item_type_attr: str,
+    structured_label: str,
+    scorer: Callable[[SchemaT, str], Awaitable[SchemaT]],
+    logger: logging.Logger,
+) -> Optional[SchemaT]:
+    """Identify one category of types (e.g. statement types) for a document.
+
+    Args:
+        content: The text content to analyze
+        primary_domain: The primary domain identified in step 1
+        sub_domain_data: The SubDomainSchema from step 2
+        topic_data: The TopicSchema from step 3
+        trace_id: The trace ID for logging purposes
+        group_id: The trace group ID for logging purposes
+        step: Step code used in messages and trace names (e.g. "4d")
+        kind: Lower-case category name (e.g. "statement")
+        examples: Example type names listed in the prompt
+        agent: The identifier agent to run
+        schema_cls: The agent's output schema
+        model: Model name recorded in the saved output
+        output_dir: Directory for the saved output file
+        output_filename: Name of the saved output file
+        items_attr: Schema field holding the identified items
+        item_type_attr: Item field holding the type name
+        structured_label: Label for the structured result log line
+        scorer: Scoring coroutine applied to a successful result
+        logger: The calling step's logger
+
+    Returns:
+        A ``schema_cls`` object if successful, None otherwise
+    """
+    label = f"{kind.title()} Type"
+    # Read once; both names are used in several messages and the saved output
+    agent_name = str(agent.name)
+    schema_name = schema_cls.__name__
+    if not primary_domain or not sub_domain_data or not topic_data:
+        logger.info("Skipping Step %s because prerequisites were not identified.", step)
+        if not primary_domain:
+            print(f"Skipping Step {step} as primary domain was not identified.")
+        elif not sub_domain_data:
+            print(f"Skipping Step {step} as sub-domain identification failed.")
+        elif not topic_data:
+            print(f"Skipping Step {step} as topic identification failed.")
+        return None
+    if not content or content.isspace():
+        # The orchestrator already stops on empty input; this covers direct callers
+        logger.info("Skipping Step %s because the input content is empty.", step)
+        print(f"Skipping Step {step} as the input content is empty.")
+        return None
+
+    logger.info("--- Running Step %s: %s ID (Agent: %s) ---", step, label, agent_name)
+    # Routine progress lines duplicate the INFO log; errors are always printed
+    if VERBOSE_OUTPUT:
+        print(f"\n--- Running Step {step}: {label} ID using model: {model} ---")
+
+    # Context derived from Steps 2 and 3, computed once and reused below
+    input_sub_domain_names = [
+        sd.sub_domain for sd in sub_domain_data.identified_sub_domains
+    ]
+    input_sub_domain_set = frozenset(input_sub_domain_names)
+    topic_count = sum(len(t.identified_topics) for t in topic_data.sub_domain_topic_map)
+
+    # All values are already strings, so the dict is passed to RunConfig as built
+    run_config = RunConfig(
+        workflow_name=f"step{step}_{kind}_types",
+        trace_id=trace_id,
+        group_id=group_id,
+        trace_metadata={
+            "workflow_step": f"{step}_{kind}_type_id",
+            "agent_name": f"{label} ID",
+            "actual_agent": agent_name,
+            "primary_domain_input": primary_domain,
+            "sub_domains_analyzed_count": str(len(input_sub_domain_names)),
+            "topics_aggregated_count": str(topic_count),
+        },
+    )
+    result_data: Optional[SchemaT] = None
+
+    # Prepare context summary for the prompt
+    context_summary_for_prompt = (
+        f"Primary Domain: {primary_domain}\n"
+        f"Identified Sub-Domains: {', '.join(input_sub_domain_names)}\n"
+        f"Previously identified topics (aggregated): {len(topic_data.sub_domain_topic_map)} sub-domains covered with topics."
+    )
+
+    # Type identification only needs representative passages of very long texts
+    prompt_content = head_tail_excerpt(content, TYPE_ID_MAX_PROMPT_CHARS)
+    if prompt_content is not content:
+        logger.warning(
+            "Step %s: text of %d characters shortened to %d characters (start and end kept) for the prompt; TYPE_ID_MAX_PROMPT_CHARS=%d.",
+            step,
+            len(content),
+            len(prompt_content),
+            TYPE_ID_MAX_PROMPT_CHARS,
+        )
+
+    input_list: List[TResponseInputItem] = [
+        {
+            "role": "user",
+            "content": type_identification_prompt_template.format(
+                kind_upper=kind.upper(),
+                examples=examples,
+                context=context_summary_for_prompt,
+                kind=kind,
+                schema_name=schema_name,
+            ),
+        },
+        {
+            "role": "user",
+            "content": full_text_block(prompt_content),
+        },
+    ]
+
+    try:
+        step_result = await cached_run_agent_with_retry(
+            agent=agent,
+            input_data=input_list,
+            config=run_config,
+        )
+
+        if step_result:
+            potential_output = getattr(step_result, "final_output", None)
+            if isinstance(potential_output, schema_cls):
+                result_data = potential_output
+                logger.info(
+                    "Successfully extracted %s from step%s_result.final_output.",
+                    schema_name,
+                    step,
+                )
+            elif isinstance(potential_output, dict):
+                try:
+                    result_data = schema_cls.model_validate(potential_output)
+                    logger.info(
+                        "Successfully validated %s from step%s_result.final_output dict.",
+                        schema_name,
+                        step,
+                    )
+                except ValidationError as e:
+                    logger.warning(
+                        "Step %s dict output failed %s validation: %s",
+                        step,
+                        schema_name,
+                        e,
+                    )
+            else:
+                logger.warning(
+                    "Step %s final_output was not %s or dict (type: %s).",
+                    step,
+                    schema_name,
+                    type(potential_output),
+                )
+
+            identified_items = getattr(result_data, items_attr, None)
+            if result_data is not None and identified_items:
+                # Ensure context fields match
+                if result_data.primary_domain != primary_domain:
+                    logger.warning(
+                        "Primary domain mismatch in Step %s output ('%s'). Overwriting with Step 1's ('%s').",
+                        step,
+                        result_data.primary_domain,
+                        primary_domain,
+                    )
+                    result_data.primary_domain = primary_domain
+                if frozenset(result_data.analyzed_sub_domains) != input_sub_domain_set:
+                    logger.warning(
+                        "Analyzed sub-domains in Step %s output %s differs from Step 2 input %s. Using Step %s's list.",
+                        step,
+                        result_data.analyzed_sub_domains,
+                        input_sub_domain_names,
+                        step,
+                    )
+
+                result_data = await scorer(result_data, content)
+                identified_items = getattr(result_data, items_attr)
+
+                # Log and print results
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(
+                        "Step %s Result: Identified %ss = [%s]",
+                        step,
+                        label,
+                        ", ".join(
+                            getattr(item, item_type_attr) for item in identified_items
+                        ),
+                    )
+                # The full structured dump can be very large; only build it when it is shown
+                if VERBOSE_OUTPUT or logger.isEnabledFor(logging.DEBUG):
+                    result_json = result_data.model_dump_json(indent=2)
+                    logger.debug(
+                        "Step %s Result (Structured %s):\n%s",
+                        step,
+                        structured_label,
+                        result_json,
+                    )
+                    if VERBOSE_OUTPUT:
+                        print(
+                            f"\n--- {label}s Identified (Structured Output from Step {step}) ---"
+                        )
+                        print(result_json)
+
+                # Save results; the output dict is only built when it will be written
+                if SAVE_INTERMEDIATE_OUTPUTS:
+                    logger.info("Saving %s type identifier output to file...", kind)
+                    if VERBOSE_OUTPUT:
+                        print(f"\nSaving {kind} type output file...")
+                    result_dump = result_data.model_dump()
+                    output_content = {
+                        "primary_domain": result_dump["primary_domain"],
+                        "analyzed_sub_domains": result_dump["analyzed_sub_domains"],
+                        items_attr: result_dump[items_attr],
+                        "analysis_summary": result_dump["analysis_summary"],
+                        "analysis_details": {
+                            "source_text_length": len(content),
+                            "primary_domain_context": primary_domain,
+                            "sub_domain_context_count": len(input_sub_domain_names),
+                            "topic_context_count": topic_count,
+                            "model_used": model,
+                            "agent_name": agent_name,
+                            "output_schema": schema_name,
+                            "timestamp_utc": datetime.now(timezone.utc).isoformat(),
+                        },
+                        "trace_information": {
+                            "trace_id": trace_id or "N/A",
+                            "notes": f"Generated by {agent_name} in Step {step} of workflow.",
+                        },
+                    }
+                    # Write the file in a worker thread so the event loop is not blocked
+                    save_result = await asyncio.to_thread(
+                        direct_save_json_output,
+                        output_dir,
+                        output_filename,
+                        output_content,
+                        trace_id,
+                    )
+                    if VERBOSE_OUTPUT:
+                        print(f"  - {save_result}")
+                    logger.info(
+                        "Result of saving %s type output: %s", kind, save_result
+                    )
+                else:
+                    logger.debug(
+                        "Step %s output not saved: SAVE_INTERMEDIATE_OUTPUTS is disabled.",
+                        step,
+                    )
+
+            elif result_data is not None:
+                logger.warning(
+                    "Step %s completed but %s list is empty.", step, items_attr
+                )
+                print(
+                    f"\nStep {step} completed, but no specific {kind} types were identified."
+                )
+                # An empty result is not treated as a failure of the workflow
+            else:  # result_data is None or validation failed
+                logger.error(
+                    "Step %s FAILED: Could not extract valid %s output.",
+                    step,
+                    schema_name,
+                )
+                print(f"\nError: Failed to identify {kind} types in Step {step}.")
+
+        else:
+            logger.error("Step %s FAILED: Runner.run did not return a result.", step)
+            print(
+                f"\nError: Failed to get a result from the {kind} type identification step."
+            )
+            result_data = None
+
+    except (ValidationError, TypeError) as e:
+        logger.exception(
+            "Validation or Type error during Step %s agent run. Error: %s",
+            step,
+            e,
+            extra={"trace_id": trace_id or "N/A"},
+        )
+        print(f"\nError: A data validation or type issue occurred during Step {step}.")
+        print(f"Error details: {e}")
+        result_data = None
+    except Exception as e:
+        logger.exception(
+            "An unexpected error occurred during Step %s.",
+            step,
+            extra={"trace_id": trace_id or "N/A"},
+        )
+        print(
+            f"\nAn unexpected error occurred during Step {step}: {type(e).__name__}: {e}"
+        )
+        result_data = None
+
+    return result_data
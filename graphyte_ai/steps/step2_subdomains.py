@@ -14,7 +14,12 @@ from ..workflow_agents import (
 )
 from ..config import SUB_DOMAIN_MODEL, SUB_DOMAIN_OUTPUT_DIR, SUB_DOMAIN_OUTPUT_FILENAME
 from ..schemas import SubDomainSchema, SubDomainDetail, SubDomainIdentifierSchema
-from ..utils import direct_save_json_output, run_agent_with_retry, score_sub_domains
+from ..utils import (
+    direct_save_json_output,
+    run_agent_with_retry,
+    score_sub_domains,
+    full_text_block,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -71,7 +76,7 @@ async def identify_subdomains(
         },
         {
             "role": "user",
-            "content": f"--- Full Text Start ---\n{content}\n--- Full Text End ---",
+            "content": full_text_block(content),
         },
     ]
 
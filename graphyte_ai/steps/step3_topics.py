@@ -3,7 +3,7 @@
 import asyncio
 import logging
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from pydantic import ValidationError
 
@@ -15,19 +15,116 @@ from agents import (
     gen_trace_id,
 )  # type: ignore[attr-defined]
 
-from ..workflow_agents import topic_identifier_agent, topic_result_agent
-from ..config import TOPIC_MODEL, TOPIC_OUTPUT_DIR, TOPIC_OUTPUT_FILENAME
+from ..workflow_agents import (
+    topic_batch_identifier_agent,
+    topic_identifier_agent,
+    topic_result_agent,
+)
+from ..config import (
+    RESULT_CACHE_ENABLED,
+    TOPIC_MAX_CONCURRENCY,
+    TOPIC_MODEL,
+    TOPIC_SUBDOMAIN_BATCH_SIZE,
+    TOPIC_OUTPUT_DIR,
+    TOPIC_OUTPUT_FILENAME,
+    VERBOSE_OUTPUT,
+)
 from ..schemas import (
     TopicSchema,
     SingleSubDomainTopicSchema,
     SingleSubDomainTopicIdentifierSchema,
     SubDomainSchema,
+    TopicBatchIdentifierSchema,
     TopicDetail,
 )
-from ..utils import direct_save_json_output, run_agent_with_retry, score_topics
+from ..utils import (
+    content_fingerprint,
+    direct_save_json_output,
+    load_cached_topics,
+    run_agent_with_retry,
+    score_topics,
+    store_cached_topics,
+    full_text_block,
+)
 
 logger = logging.getLogger(__name__)
 
+# Marks a sub-domain whose agent call returned no result object
+_NO_RESULT = object()
+
+# Instruction messages for the single and batched topic agents; the sub-domain
+# names are filled in per call. Both are part of the topic cache key.
+topic_prompt_template = (
+    "The primary domain is '{primary_domain}'. Focus ONLY on the sub-domain: '{sub_domain}'. "
+    "Based ONLY on the text above, identify specific topics mentioned within the text relevant ONLY to this sub-domain ('{sub_domain}'). "
+    "Output using the required SingleSubDomainTopicIdentifierSchema."
+)
+topic_batch_prompt_template = (
+    "The primary domain is '{primary_domain}'. Focus ONLY on these sub-domains: {quoted_sub_domains}. "
+    "Based ONLY on the text above, identify specific topics mentioned within the text for EACH of these sub-domains separately. "
+    "Output using the required TopicBatchIdentifierSchema with exactly one result per sub-domain, using the sub-domain names exactly as given."
+)
+
+
+def _split_topic_batch_output(
+    batch: List[str], batch_output: Any
+) -> List[Tuple[str, Any]]:
+    """Map a batched topic agent output back to one output per requested sub-domain.
+
+    Results are matched by sub-domain name, falling back to position for results
+    whose name matches none of the requested sub-domains. Sub-domains without a
+    result get ``None``.
+    """
+    batch_data: Optional[TopicBatchIdentifierSchema] = None
+    if isinstance(batch_output, TopicBatchIdentifierSchema):
+        batch_data = batch_output
+    elif isinstance(batch_output, dict):
+        try:
+            batch_data = TopicBatchIdentifierSchema.model_validate(batch_output)
+        except ValidationError as e:
+            logger.warning(
+                "Batched topic output for %s failed TopicBatchIdentifierSchema validation: %s",
+                batch,
+                e,
+            )
+    else:
+        logger.warning(
+            "Batched topic output for %s was not TopicBatchIdentifierSchema or dict (type: %s).",
+            batch,
+            type(batch_output),
+        )
+    if batch_data is None:
+        return [(sub_domain, None) for sub_domain in batch]
+
+    requested = {sub_domain.strip().lower() for sub_domain in batch}
+    by_name = {
+        result.sub_domain.strip().lower(): result for result in batch_data.results
+    }
+    outcomes: List[Tuple[str, Any]] = []
+    for position, sub_domain in enumerate(batch):
+        result = by_name.get(sub_domain.strip().lower())
+        if result is None and position < len(batch_data.results):
+            candidate = batch_data.results[position]
+            if candidate.sub_domain.strip().lower() not in requested:
+                result = candidate
+        outcomes.append((sub_domain, result))
+    return outcomes
+
+
+def _expand_topic_task_outcome(
+    batch: List[str], result_or_exc: Any
+) -> List[Tuple[str, Any]]:
+    """Expand one finished topic task into a (sub-domain, output) pair per sub-domain."""
+    if isinstance(result_or_exc, BaseException):
+        return [(sub_domain, result_or_exc) for sub_domain in batch]
+    if not result_or_exc:
+        return [(sub_domain, _NO_RESULT) for sub_domain in batch]
+    if len(batch) == 1:
+        return [(batch[0], getattr(result_or_exc, "final_output", None))]
+    return _split_topic_batch_output(
+        batch, getattr(result_or_exc, "final_output", None)
+    )
+
 
 async def identify_topics(
     content: str,
@@ -60,97 +157,217 @@ async def identify_topics(
         for item in sub_domain_data.identified_sub_domains
         if item.sub_domain and item.sub_domain.strip()
     ]
+    # Each sub-domain gets one task and one result slot, so names repeated by
+    # Step 2 are queried once. Names are compared case-insensitively, the same
+    # way batched results are matched back to sub-domains; the first spelling wins.
+    unique_sub_domains_by_key: Dict[str, str] = {}
+    for sub_domain in sub_domains_list_for_step3:
+        unique_sub_domains_by_key.setdefault(sub_domain.lower(), sub_domain)
+    unique_sub_domains = list(unique_sub_domains_by_key.values())
+    if len(unique_sub_domains) != len(sub_domains_list_for_step3):
+        logger.warning(
+            "Step 2 returned duplicate sub-domain names (ignoring case); querying %d unique sub-domain(s) instead of %d.",
+            len(unique_sub_domains),
+            len(sub_domains_list_for_step3),
+        )
+        sub_domains_list_for_step3 = unique_sub_domains
 
     if not sub_domains_list_for_step3:
         logger.info("Skipping Step 3 because no valid sub-domains were identified.")
         print("Skipping Step 3 as no valid sub-domains were identified.")
         return None
 
+    # Batches of more than one sub-domain go to the batched topic agent
+    step3_configured_agent = (
+        topic_identifier_agent
+        if TOPIC_SUBDOMAIN_BATCH_SIZE == 1
+        else topic_batch_identifier_agent
+    )
     logger.info(
-        f"--- Starting Step 3: PARALLEL Topic ID (Agent: {topic_identifier_agent.name}) for {len(sub_domains_list_for_step3)} Sub-Domain(s) ---"
+        "--- Starting Step 3: PARALLEL Topic ID (Agent: %s) for %d Sub-Domain(s) ---",
+        step3_configured_agent.name,
+        len(sub_domains_list_for_step3),
     )
     print(f"\n--- Running Step 3: PARALLEL Topic ID using model: {TOPIC_MODEL} ---")
 
+    # Caps concurrent agent calls so many sub-domains do not trip provider rate limits
+    topic_semaphore = asyncio.Semaphore(TOPIC_MAX_CONCURRENCY)
+
     async def _topic_task(
         sub_domain: str,
+        agent: Any,
         input_list: List[TResponseInputItem],
         metadata: dict[str, str],
     ) -> RunResult:
-        """Run the topic identifier agent for a single sub-domain within a trace."""
+        """Run a topic identifier agent for one sub-domain (or batch) within a trace."""
 
         step3_iter_trace_id = gen_trace_id()
         step3_iter_run_config = RunConfig(
             workflow_name="step3_topics",
             trace_id=step3_iter_trace_id,
             group_id=group_id,
-            trace_metadata={k: str(v) for k, v in metadata.items()},
+            trace_metadata=metadata,  # Values are already strings
         )
-        with custom_span(f"Step3 topic ID: {sub_domain}"):
-            return await run_agent_with_retry(
-                agent=topic_identifier_agent,
-                input_data=input_list,
-                config=step3_iter_run_config,
+        async with topic_semaphore:
+            with custom_span(f"Step3 topic ID: {sub_domain}"):
+                return await run_agent_with_retry(
+                    agent=agent,
+                    input_data=input_list,
+                    config=step3_iter_run_config,
+                )
+
+    # Sub-domains covered by each task, keyed by the task so results can be
+    # matched up in completion order
+    topic_tasks: Dict[asyncio.Task, List[str]] = {}
+    # Flat list of sub-domains attempted, including ones answered from the cache
+    sub_domains_being_processed: List[str] = list(sub_domains_list_for_step3)
+    # One result slot per sub-domain, in Step 2 order; tasks finish out of order
+    topic_result_slots: List[Optional[SingleSubDomainTopicSchema]] = [None] * len(
+        sub_domains_being_processed
+    )
+    sub_domain_positions = {
+        sd: position for position, sd in enumerate(sub_domains_being_processed)
+    }
+    cached_sub_domain_count = 0
+
+    # Sub-domains already resolved for this exact text skip the agent call entirely
+    sub_domains_to_query = sub_domains_list_for_step3
+    content_hash: Optional[str] = None
+    if RESULT_CACHE_ENABLED:
+        content_hash = content_fingerprint(content)
+        # Only reuse results from the agent and prompt this run would use
+        if TOPIC_SUBDOMAIN_BATCH_SIZE == 1:
+            lookup_agent, lookup_template = (
+                topic_identifier_agent,
+                topic_prompt_template,
+            )
+        else:
+            lookup_agent, lookup_template = (
+                topic_batch_identifier_agent,
+                topic_batch_prompt_template,
+            )
+        sub_domains_to_query = []
+        for sub_domain in sub_domains_list_for_step3:
+            cached_topic_data = await asyncio.to_thread(
+                load_cached_topics,
+                primary_domain,
+                sub_domain,
+                TOPIC_MODEL,
+                content_hash,
+                lookup_agent,
+                lookup_template,
             )
+            if cached_topic_data is None:
+                sub_domains_to_query.append(sub_domain)
+            else:
+                cached_topic_data.sub_domain = sub_domain
+                topic_result_slots[sub_domain_positions[sub_domain]] = cached_topic_data
+                cached_sub_domain_count += 1
+        if cached_sub_domain_count:
+            logger.info(
+                "Reusing cached topics for %d of %d sub-domain(s).",
+                cached_sub_domain_count,
+                len(sub_domains_list_for_step3),
+            )
+            print(f"Using cached topics for {cached_sub_domain_count} sub-domain(s).")
 
-    topic_tasks = []
-    sub_domains_being_processed = (
-        []
-    )  # Keep track of which sub-domain corresponds to which task/result
-    aggregated_topic_results: List[SingleSubDomainTopicSchema] = []
+    # Group sub-domains so each agent call covers up to TOPIC_SUBDOMAIN_BATCH_SIZE of them
+    # (1 = one call per sub-domain); the full text is sent once per call, not per sub-domain
+    batches_for_step3 = [
+        sub_domains_to_query[i : i + TOPIC_SUBDOMAIN_BATCH_SIZE]
+        for i in range(0, len(sub_domains_to_query), TOPIC_SUBDOMAIN_BATCH_SIZE)
+    ]
 
-    # --- Prepare tasks for parallel execution ---
-    for index, current_sub_domain in enumerate(sub_domains_list_for_step3):
-        if not current_sub_domain:  # Should have been filtered, but double-check
-            logger.warning(
-                f"Skipping empty sub-domain string at index {index} during task preparation for Step 3."
-            )
-            continue
+    # Agents and per-call schemas that produced this run's results: single
+    # sub-domain calls, batched calls, and cache entries from the configured mode
+    batch_lengths = {len(batch) for batch in batches_for_step3}
+    if cached_sub_domain_count:
+        batch_lengths.add(TOPIC_SUBDOMAIN_BATCH_SIZE)
+    topic_agents_used: List[Tuple[Any, type]] = []
+    if 1 in batch_lengths:
+        topic_agents_used.append(
+            (topic_identifier_agent, SingleSubDomainTopicIdentifierSchema)
+        )
+    if any(length > 1 for length in batch_lengths):
+        topic_agents_used.append(
+            (topic_batch_identifier_agent, TopicBatchIdentifierSchema)
+        )
+    topic_agent_names = ", ".join(str(agent.name) for agent, _ in topic_agents_used)
+    topic_call_schemas = ", ".join(schema.__name__ for _, schema in topic_agents_used)
+
+    # Trace metadata shared by every task; each task adds its own keys
+    step3_base_metadata_for_trace = {
+        "actual_agent": str(topic_identifier_agent.name),
+        "primary_domain_input": primary_domain,
+        # batch_size keeps its original meaning: the number of sub-domains in Step 3
+        "batch_size": str(len(sub_domains_list_for_step3)),
+        "batch_count": str(len(batches_for_step3)),
+    }
 
+    # One full-text message shared by every task, rather than a copy per task
+    step3_full_text_message: TResponseInputItem = {
+        "role": "user",
+        "content": full_text_block(content),
+    }
+
+    # --- Prepare tasks for parallel execution ---
+    for index, batch in enumerate(batches_for_step3):
+        batch_label = (
+            batch[0] if len(batch) == 1 else f"{batch[0]} (+{len(batch) - 1} more)"
+        )
         logger.debug(
-            f"Preparing task for Step 3 ({index+1}/{len(sub_domains_list_for_step3)}): Sub-Domain '{current_sub_domain}'"
+            "Preparing task for Step 3 (%d/%d): Sub-Domain(s) %s",
+            index + 1,
+            len(batches_for_step3),
+            batch,
         )
 
         display_sub_domain = (
-            (current_sub_domain[:25] + "...")
-            if len(current_sub_domain) > 28
-            else current_sub_domain
+            (batch_label[:25] + "...") if len(batch_label) > 28 else batch_label
         )
         step3_iter_metadata_for_trace = {
+            **step3_base_metadata_for_trace,
             "workflow_step": f"3_topic_id_batch_{index+1}",
             "agent_name": f"Topic ID ({display_sub_domain})",
-            "actual_agent": str(topic_identifier_agent.name),
-            "primary_domain_input": primary_domain,
-            "sub_domain_analyzed": current_sub_domain,
+            "sub_domain_analyzed": ", ".join(batch),
             "batch_index": str(index + 1),
-            "batch_size": str(len(sub_domains_list_for_step3)),
         }
+        if len(batch) == 1:
+            batch_agent = topic_identifier_agent
+            batch_instruction = topic_prompt_template.format(
+                primary_domain=primary_domain, sub_domain=batch[0]
+            )
+        else:
+            batch_agent = topic_batch_identifier_agent
+            step3_iter_metadata_for_trace["actual_agent"] = str(batch_agent.name)
+            batch_instruction = topic_batch_prompt_template.format(
+                primary_domain=primary_domain,
+                quoted_sub_domains=", ".join(f"'{sd}'" for sd in batch),
+            )
+        # The full text goes first so every topic call shares the same prompt prefix,
+        # letting the provider's prompt cache reuse it across sub-domains
         step3_iter_input_list: List[TResponseInputItem] = [
+            step3_full_text_message,
             {
                 "role": "user",
-                "content": f"The primary domain is '{primary_domain}'. Focus ONLY on the sub-domain: '{current_sub_domain}'. Based ONLY on the following text, identify specific topics mentioned within the text relevant ONLY to this sub-domain ('{current_sub_domain}'). Output using the required SingleSubDomainTopicIdentifierSchema.",
-            },
-            {
-                "role": "user",
-                "content": f"--- Full Text Start ---\n{content}\n--- Full Text End ---",
+                "content": batch_instruction,
             },
         ]
 
         # Create the async task using the helper wrapper
         task = asyncio.create_task(
             _topic_task(
-                current_sub_domain,
+                batch_label,
+                batch_agent,
                 step3_iter_input_list,
                 step3_iter_metadata_for_trace,
             ),
-            name=f"TopicTask_{current_sub_domain[:20]}",  # Optional: name task for debugging
+            name=f"TopicTask_{batch_label[:20]}",  # Optional: name task for debugging
         )
-        topic_tasks.append(task)
-        sub_domains_being_processed.append(
-            current_sub_domain
-        )  # Track the sub-domain for this task
+        topic_tasks[task] = batch  # Track the sub-domains for this task
 
     # --- Execute tasks in parallel ---
-    if not topic_tasks:
+    if not topic_tasks and not cached_sub_domain_count:
         logger.warning(
             "No valid sub-domains found to process in Step 3. Skipping parallel execution and subsequent steps."
         )
@@ -158,144 +375,227 @@ async def identify_topics(
         return None
 
     logger.info(
-        f"Launching {len(topic_tasks)} topic identification tasks in parallel..."
+        "Launching %d topic identification tasks for %d sub-domains in parallel (max %d concurrent)...",
+        len(topic_tasks),
+        len(sub_domains_to_query),
+        TOPIC_MAX_CONCURRENCY,
     )
     print(
-        f"Running topic identification for {len(topic_tasks)} sub-domains concurrently..."
+        f"Running topic identification for {len(sub_domains_to_query)} sub-domains concurrently..."
     )
 
-    # Use asyncio.gather to run tasks concurrently and collect results/exceptions
-    step3_results_list = await asyncio.gather(*topic_tasks, return_exceptions=True)
-    logger.info("Parallel topic identification tasks completed.")
-    print("Parallel topic identification runs finished. Processing results...")
-
-    # --- Process results from parallel execution ---
-    for index, step3_iter_result_or_exc in enumerate(step3_results_list):
-        current_sub_domain = sub_domains_being_processed[
-            index
-        ]  # Get corresponding sub-domain
+    print("Processing topic results as each sub-domain completes...")
 
-        try:
-            # Check if an exception was returned by gather
-            if isinstance(step3_iter_result_or_exc, Exception):
-                logger.error(
-                    f"Step 3 task for '{current_sub_domain}' failed with exception: {step3_iter_result_or_exc}",
-                    exc_info=step3_iter_result_or_exc,
-                )
-                print(
-                    f"  - Error processing sub-domain '{current_sub_domain}': {type(step3_iter_result_or_exc).__name__}: {step3_iter_result_or_exc}"
-                )
-                continue  # Skip to the next result
-
-            # If no exception, it should be a RunResult (or None)
-            step3_iter_result: Optional[RunResult] = step3_iter_result_or_exc
-
-            if step3_iter_result:
-                potential_output_iter = getattr(step3_iter_result, "final_output", None)
-                single_topic_data: Optional[SingleSubDomainTopicSchema] = None
-                raw_topic_data: Optional[SingleSubDomainTopicIdentifierSchema] = None
+    # Canonical comparison keys for the requested sub-domains, computed once
+    requested_sub_domain_keys = {
+        sd: sd.strip().lower() for sd in sub_domains_being_processed
+    }
 
-                if isinstance(
-                    potential_output_iter, SingleSubDomainTopicIdentifierSchema
-                ):
-                    raw_topic_data = potential_output_iter
-                    logger.info(
-                        f"Successfully extracted SingleSubDomainTopicIdentifierSchema for '{current_sub_domain}'."
+    # Handle each result as soon as its task finishes instead of waiting for the
+    # slowest sub-domain, so progress and validation start early
+    pending_topic_tasks = set(topic_tasks)
+    try:
+        while pending_topic_tasks:
+            done_topic_tasks, pending_topic_tasks = await asyncio.wait(
+                pending_topic_tasks, return_when=asyncio.FIRST_COMPLETED
+            )
+            for finished_task in done_topic_tasks:
+                if finished_task.cancelled():
+                    step3_iter_result_or_exc: Any = asyncio.CancelledError()
+                else:
+                    step3_iter_result_or_exc = (
+                        finished_task.exception() or finished_task.result()
                     )
-                elif isinstance(potential_output_iter, dict):
+                for (
+                    current_sub_domain,
+                    potential_output_iter,
+                ) in _expand_topic_task_outcome(
+                    topic_tasks[finished_task], step3_iter_result_or_exc
+                ):
                     try:
-                        raw_topic_data = (
-                            SingleSubDomainTopicIdentifierSchema.model_validate(
-                                potential_output_iter
+                        # Check if the task for this sub-domain raised an exception
+                        if isinstance(potential_output_iter, BaseException):
+                            # Type and message only; the traceback is logged at DEBUG
+                            logger.error(
+                                "Step 3 task for '%s' failed: %s: %s",
+                                current_sub_domain,
+                                type(potential_output_iter).__name__,
+                                potential_output_iter,
                             )
-                        )
-                        logger.info(
-                            f"Successfully validated SingleSubDomainTopicIdentifierSchema from dict for '{current_sub_domain}'."
-                        )
-                    except ValidationError as e:
-                        logger.warning(
-                            f"Dict output for '{current_sub_domain}' failed SingleSubDomainTopicIdentifierSchema validation: {e}"
-                        )
-                else:
-                    logger.warning(
-                        f"Output for '{current_sub_domain}' was not SingleSubDomainTopicIdentifierSchema or dict (type: {type(potential_output_iter)}). Raw: {potential_output_iter}"
-                    )
+                            if logger.isEnabledFor(logging.DEBUG):
+                                logger.debug(
+                                    "Traceback for failed Step 3 task '%s'",
+                                    current_sub_domain,
+                                    exc_info=potential_output_iter,
+                                )
+                            print(
+                                f"  - Error processing sub-domain '{current_sub_domain}': {type(potential_output_iter).__name__}: {potential_output_iter}"
+                            )
+                            continue  # Skip to the next result
 
-                if raw_topic_data:
-                    single_topic_data = SingleSubDomainTopicSchema(
-                        sub_domain=raw_topic_data.sub_domain,
-                        identified_topics=[
-                            TopicDetail(
-                                topic=item.topic,
-                                confidence_score=None,
-                                relevance_score=None,
-                                clarity_score=None,
+                        if potential_output_iter is _NO_RESULT:
+                            logger.error(
+                                "Step 3 task for '%s' returned no result object (result was None or Falsy).",
+                                current_sub_domain,
+                            )
+                            print(
+                                f"  - Error: Failed to get result object for sub-domain '{current_sub_domain}'."
+                            )
+                            continue
+
+                        single_topic_data: Optional[SingleSubDomainTopicSchema] = None
+                        raw_topic_data: Optional[
+                            SingleSubDomainTopicIdentifierSchema
+                        ] = None
+
+                        if isinstance(
+                            potential_output_iter, SingleSubDomainTopicIdentifierSchema
+                        ):
+                            raw_topic_data = potential_output_iter
+                            logger.info(
+                                "Successfully extracted SingleSubDomainTopicIdentifierSchema for '%s'.",
+                                current_sub_domain,
+                            )
+                        elif isinstance(potential_output_iter, dict):
+                            try:
+                                raw_topic_data = (
+                                    SingleSubDomainTopicIdentifierSchema.model_validate(
+                                        potential_output_iter
+                                    )
+                                )
+                                logger.info(
+                                    "Successfully validated SingleSubDomainTopicIdentifierSchema from dict for '%s'.",
+                                    current_sub_domain,
+                                )
+                            except ValidationError as e:
+                                logger.warning(
+                                    "Dict output for '%s' failed SingleSubDomainTopicIdentifierSchema validation: %s",
+                                    current_sub_domain,
+                                    e,
+                                )
+                        else:
+                            logger.warning(
+                                "Output for '%s' was not SingleSubDomainTopicIdentifierSchema or dict (type: %s). Raw: %s",
+                                current_sub_domain,
+                                type(potential_output_iter),
+                                potential_output_iter,
+                            )
+
+                        if raw_topic_data:
+                            # Fields were validated when the agent output arrived
+                            single_topic_data = SingleSubDomainTopicSchema.trusted(
+                                sub_domain=raw_topic_data.sub_domain,
+                                identified_topics=[
+                                    TopicDetail.trusted(
+                                        topic=item.topic,
+                                        confidence_score=None,
+                                        relevance_score=None,
+                                        clarity_score=None,
+                                    )
+                                    for item in raw_topic_data.identified_topics
+                                ],
+                            )
+
+                        if single_topic_data:
+                            # Ensure the sub_domain in the output matches the one requested
+                            if (
+                                single_topic_data.sub_domain.strip().lower()
+                                != requested_sub_domain_keys[current_sub_domain]
+                            ):
+                                logger.warning(
+                                    "Sub-domain mismatch in output for '%s'. Output had '%s'. Correcting to requested sub-domain.",
+                                    current_sub_domain,
+                                    single_topic_data.sub_domain,
+                                )
+                                single_topic_data.sub_domain = current_sub_domain  # Overwrite with the requested sub-domain
+
+                            topic_names = [
+                                f"'{item.topic}'"
+                                for item in single_topic_data.identified_topics
+                            ]
+                            logger.info(
+                                "Step 3 Result for '%s': Identified Topics = [%s]",
+                                current_sub_domain,
+                                ", ".join(topic_names),
+                            )
+                            print(
+                                f"\n  --- Topics for Sub-Domain: '{current_sub_domain}' ---"
+                            )
+                            if topic_names:
+                                for item in single_topic_data.identified_topics:
+                                    print(f"     - {item.topic}")
+                            else:
+                                print(
+                                    "     - (No specific topics identified for this sub-domain)"
+                                )
+                            # Record the successfully processed result
+                            topic_result_slots[
+                                sub_domain_positions[current_sub_domain]
+                            ] = single_topic_data
+                            if content_hash is not None:
+                                # Stored under the agent and prompt that produced it
+                                if len(topic_tasks[finished_task]) == 1:
+                                    producing_agent, producing_template = (
+                                        topic_identifier_agent,
+                                        topic_prompt_template,
+                                    )
+                                else:
+                                    producing_agent, producing_template = (
+                                        topic_batch_identifier_agent,
+                                        topic_batch_prompt_template,
+                                    )
+                                await asyncio.to_thread(
+                                    store_cached_topics,
+                                    primary_domain,
+                                    current_sub_domain,
+                                    TOPIC_MODEL,
+                                    content_hash,
+                                    producing_agent,
+                                    producing_template,
+                                    single_topic_data,
+                                )
+                        else:
+                            logger.warning(
+                                "Could not extract valid topic data for sub-domain '%s'. Raw output: %s",
+                                current_sub_domain,
+                                potential_output_iter,
+                            )
+                            print(
+                                f"  - Warning: Failed to get structured topics for '{current_sub_domain}'."
                             )
-                            for item in raw_topic_data.identified_topics
-                        ],
-                    )
 
-                if single_topic_data:
-                    # Ensure the sub_domain in the output matches the one requested
-                    if (
-                        single_topic_data.sub_domain.strip().lower()
-                        != current_sub_domain.strip().lower()
-                    ):
-                        logger.warning(
-                            f"Sub-domain mismatch in output for '{current_sub_domain}'. Output had '{single_topic_data.sub_domain}'. Correcting to requested sub-domain."
+                    except (ValidationError, TypeError) as e:
+                        logger.exception(
+                            "Validation or Type error processing result for '%s'. Error: %s",
+                            current_sub_domain,
+                            e,
+                            extra={"trace_id": trace_id or "N/A"},
                         )
-                        single_topic_data.sub_domain = current_sub_domain  # Overwrite with the requested sub-domain
-
-                    topic_names = [
-                        f"'{item.topic}'"
-                        for item in single_topic_data.identified_topics
-                    ]
-                    logger.info(
-                        f"Step 3 Result for '{current_sub_domain}': Identified Topics = [{', '.join(topic_names)}]"
-                    )
-                    print(f"\n  --- Topics for Sub-Domain: '{current_sub_domain}' ---")
-                    if topic_names:
-                        for item in single_topic_data.identified_topics:
-                            print(f"     - {item.topic}")
-                    else:
                         print(
-                            "     - (No specific topics identified for this sub-domain)"
+                            f"\nError: A data validation or type issue occurred processing result for sub-domain '{current_sub_domain}'."
                         )
-                    # Add the successfully processed result to the list
-                    aggregated_topic_results.append(single_topic_data)
-                else:
-                    logger.warning(
-                        f"Could not extract valid topic data for sub-domain '{current_sub_domain}'. Raw output: {potential_output_iter}"
-                    )
-                    print(
-                        f"  - Warning: Failed to get structured topics for '{current_sub_domain}'."
-                    )
-            else:
-                logger.error(
-                    f"Step 3 task for '{current_sub_domain}' returned no result object (result was None or Falsy)."
-                )
-                print(
-                    f"  - Error: Failed to get result object for sub-domain '{current_sub_domain}'."
-                )
-
-        except (ValidationError, TypeError) as e:
-            logger.exception(
-                f"Validation or Type error processing result for '{current_sub_domain}'. Error: {e}",
-                extra={"trace_id": trace_id or "N/A"},
-            )
-            print(
-                f"\nError: A data validation or type issue occurred processing result for sub-domain '{current_sub_domain}'."
-            )
-            print(f"Error details: {e}")
-        except Exception as e:
-            logger.exception(
-                f"An unexpected error occurred processing result for '{current_sub_domain}'.",
-                extra={"trace_id": trace_id or "N/A"},
-            )
-            print(
-                f"\nAn unexpected error occurred processing result for sub-domain '{current_sub_domain}': {type(e).__name__}: {e}"
-            )
+                        print(f"Error details: {e}")
+                    except Exception as e:
+                        logger.exception(
+                            "An unexpected error occurred processing result for '%s'.",
+                            current_sub_domain,
+                            extra={"trace_id": trace_id or "N/A"},
+                        )
+                        print(
+                            f"\nAn unexpected error occurred processing result for sub-domain '{current_sub_domain}': {type(e).__name__}: {e}"
+                        )
+    finally:
+        # If this step is cancelled (Ctrl-C, an upstream timeout), stop the
+        # outstanding agent calls instead of leaving them running
+        for pending_topic_task in pending_topic_tasks:
+            pending_topic_task.cancel()
     # --- End of processing loop for parallel results ---
+    logger.info("Parallel topic identification tasks completed.")
+
+    # Drop sub-domains without a result; the slots already hold Step 2 order
+    aggregated_topic_results: List[SingleSubDomainTopicSchema] = [
+        result for result in topic_result_slots if result is not None
+    ]
 
     # === After Parallel Runs: Aggregate and Save Final Topic Output ===
     if not aggregated_topic_results:
@@ -311,7 +611,7 @@ async def identify_topics(
     print("\n--- Aggregating and Saving Final Topic Analysis (from parallel runs) ---")
 
     # Store the final aggregated data for Step 4
-    final_topic_data = TopicSchema(
+    final_topic_data = TopicSchema.trusted(
         primary_domain=primary_domain,  # Use the confirmed primary domain from Step 1
         sub_domain_topic_map=aggregated_topic_results,
         analysis_summary=f"Generated topics in parallel for {len(aggregated_topic_results)} sub-domains (out of {len(sub_domains_being_processed)} attempted).",  # Use processed count
@@ -348,19 +648,19 @@ async def identify_topics(
     else:
         final_topic_data = TopicSchema.model_validate(final_topic_data.model_dump())
 
-    logger.info(
-        f"Final Aggregated Topics (Structured):\n{final_topic_data.model_dump_json(indent=2)}"
-    )
-    print(
-        "\n--- Final Aggregated Topics (Structured Output from Step 3 Parallel Runs) ---"
-    )
-    print(final_topic_data.model_dump_json(indent=2))
+    # The full structured dump can be very large; only build it when it is shown
+    if VERBOSE_OUTPUT or logger.isEnabledFor(logging.DEBUG):
+        final_topic_json = final_topic_data.model_dump_json(indent=2)
+        logger.debug("Final Aggregated Topics (Structured):\n%s", final_topic_json)
+        if VERBOSE_OUTPUT:
+            print(
+                "\n--- Final Aggregated Topics (Structured Output from Step 3 Parallel Runs) ---"
+            )
+            print(final_topic_json)
 
     topic_output_content = {
         "primary_domain": final_topic_data.primary_domain,
-        "sub_domain_topic_map": [
-            item.model_dump() for item in final_topic_data.sub_domain_topic_map
-        ],
+        "sub_domain_topic_map": final_topic_data.model_dump()["sub_domain_topic_map"],
         "analysis_summary": final_topic_data.analysis_summary,
         "analysis_details": {
             "source_text_length": len(content),
@@ -370,19 +670,21 @@ async def identify_topics(
                 item.sub_domain for item in aggregated_topic_results
             ],
             "sub_domain_input_source": "List extracted from Step 2 output (SubDomainSchema)",
-            "execution_mode": "Parallel (asyncio.gather)",
+            "execution_mode": "Parallel (asyncio.wait, results processed as completed)",
             "model_used_per_topic_call": TOPIC_MODEL,
-            "agent_name_per_topic_call": topic_identifier_agent.name,
+            "agent_name_per_topic_call": topic_agent_names,
             "output_schema_final": TopicSchema.__name__,
-            "output_schema_per_call": SingleSubDomainTopicIdentifierSchema.__name__,
+            "output_schema_per_call": topic_call_schemas,
             "timestamp_utc": datetime.now(timezone.utc).isoformat(),
         },
         "trace_information": {
             "trace_id": trace_id or "N/A",
-            "notes": f"Aggregated from PARALLEL calls to {topic_identifier_agent.name} in Step 3 of workflow.",
+            "notes": f"Aggregated from PARALLEL calls to {topic_agent_names} in Step 3 of workflow.",
         },
     }
-    save_result_step3_final = direct_save_json_output(
+    # Write the file in a worker thread so the event loop is not blocked
+    save_result_step3_final = await asyncio.to_thread(
+        direct_save_json_output,
         TOPIC_OUTPUT_DIR,
         TOPIC_OUTPUT_FILENAME,
         topic_output_content,
@@ -391,7 +693,8 @@ async def identify_topics(
     print("\nSaving final aggregated topic output file...")
     print(f"  - {save_result_step3_final}")
     logger.info(
-        f"Result of saving final aggregated topic output: {save_result_step3_final}"
+        "Result of saving final aggregated topic output: %s",
+        save_result_step3_final,
     )
 
     return final_topic_data
@@ -23,6 +23,7 @@ from ..utils import (
     direct_save_json_output,
     run_agent_with_retry,
     score_entity_types,
+    full_text_block,
 )
 
 logger = logging.getLogger(__name__)
@@ -103,7 +104,7 @@ async def identify_entity_types(
         },
         {
             "role": "user",
-            "content": f"--- Full Text Start ---\n{content}\n--- Full Text End ---",
+            "content": full_text_block(content),
         },
     ]
 
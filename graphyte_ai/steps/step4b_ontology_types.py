@@ -19,6 +19,7 @@ from ..utils import (
     direct_save_json_output,
     run_agent_with_retry,
     score_ontology_types,
+    full_text_block,
 )
 
 logger = logging.getLogger(__name__)
@@ -101,7 +102,7 @@ async def identify_ontology_types(
         },
         {
             "role": "user",
-            "content": f"--- Full Text Start ---\n{content}\n--- Full Text End ---",
+            "content": full_text_block(content),
         },
     ]
 
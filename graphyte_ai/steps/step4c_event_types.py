@@ -1,5 +1,6 @@
 """Step 4c: Event type identification functionality."""
 
+import asyncio
 import logging
 from datetime import datetime, timezone
 from typing import List, Optional
@@ -13,6 +14,7 @@ from ..config import (
     EVENT_TYPE_MODEL,
     EVENT_TYPE_OUTPUT_DIR,
     EVENT_TYPE_OUTPUT_FILENAME,
+    VERBOSE_OUTPUT,
 )  # Import new config vars
 from ..schemas import (
     EventTypeSchema,
@@ -23,6 +25,7 @@ from ..utils import (
     direct_save_json_output,
     run_agent_with_retry,
     score_event_types,
+    full_text_block,
 )
 
 logger = logging.getLogger(__name__)
@@ -64,15 +67,20 @@ async def identify_event_types(
     )
     print(f"\n--- Running Step 4c: Event Type ID using model: {EVENT_TYPE_MODEL} ---")
 
+    # Context derived from Steps 2 and 3, computed once and reused below
+    input_sub_domain_names = [
+        sd.sub_domain for sd in sub_domain_data.identified_sub_domains
+    ]
+    input_sub_domain_set = frozenset(input_sub_domain_names)
+    topic_count = sum(len(t.identified_topics) for t in topic_data.sub_domain_topic_map)
+
     step4c_metadata_for_trace = {
         "workflow_step": "4c_event_type_id",
         "agent_name": "Event Type ID",
         "actual_agent": str(event_type_identifier_agent.name),
         "primary_domain_input": primary_domain,
-        "sub_domains_analyzed_count": str(len(sub_domain_data.identified_sub_domains)),
-        "topics_aggregated_count": str(
-            sum(len(t.identified_topics) for t in topic_data.sub_domain_topic_map)
-        ),
+        "sub_domains_analyzed_count": str(len(input_sub_domain_names)),
+        "topics_aggregated_count": str(topic_count),
     }
     step4c_run_config = RunConfig(
         workflow_name="step4c_event_types",
@@ -86,25 +94,26 @@ async def identify_event_types(
     # Prepare context summary for the prompt
     context_summary_for_prompt = (
         f"Primary Domain: {primary_domain}\n"
-        f"Identified Sub-Domains: {', '.join(sd.sub_domain for sd in sub_domain_data.identified_sub_domains)}\n"
+        f"Identified Sub-Domains: {', '.join(input_sub_domain_names)}\n"
         f"Previously identified topics (aggregated): {len(topic_data.sub_domain_topic_map)} sub-domains covered with topics."
         # Optionally add more topic detail here if needed
     )
 
+    # Full text first, as in Step 3, so the large prefix is shared with cached prompts
     step4c_input_list: List[TResponseInputItem] = [
+        {
+            "role": "user",
+            "content": full_text_block(content),
+        },
         {
             "role": "user",
             "content": (
-                f"Analyze the following text to identify key EVENT types (e.g., Meeting, Acquisition, Conference, Product Launch, Election). "
+                f"Analyze the text above to identify key EVENT types (e.g., Meeting, Acquisition, Conference, Product Launch, Election). "
                 f"Focus only on event types. Use the provided context:\n{context_summary_for_prompt}\n\n"
                 f"Identify event types relevant to this overall context. "
                 f"Output ONLY using the required EventTypeSchema, including the primary_domain and analyzed_sub_domains list in the output."
             ),
         },
-        {
-            "role": "user",
-            "content": f"--- Full Text Start ---\n{content}\n--- Full Text End ---",
-        },
     ]
 
     try:
@@ -143,11 +152,9 @@ async def identify_event_types(
                         f"Primary domain mismatch in Step 4c output ('{event_data.primary_domain}'). Overwriting with Step 1's ('{primary_domain}')."
                     )
                     event_data.primary_domain = primary_domain
-                if set(event_data.analyzed_sub_domains) != set(
-                    sd.sub_domain for sd in sub_domain_data.identified_sub_domains
-                ):
+                if frozenset(event_data.analyzed_sub_domains) != input_sub_domain_set:
                     logger.warning(
-                        f"Analyzed sub-domains in Step 4c output {event_data.analyzed_sub_domains} differs from Step 2 input { [sd.sub_domain for sd in sub_domain_data.identified_sub_domains]}. Using Step 4c's list."
+                        f"Analyzed sub-domains in Step 4c output {event_data.analyzed_sub_domains} differs from Step 2 input {input_sub_domain_names}. Using Step 4c's list."
                     )
 
                 event_data = await score_event_types(event_data, content)
@@ -159,13 +166,15 @@ async def identify_event_types(
                 logger.info(
                     f"Step 4c Result: Identified Event Types = [{', '.join(event_log_items)}]"
                 )
-                logger.info(
-                    f"Step 4c Result (Structured Events):\n{event_data.model_dump_json(indent=2)}"
-                )
-                print(
-                    "\n--- Event Types Identified (Structured Output from Step 4c) ---"
-                )
-                print(event_data.model_dump_json(indent=2))
+                # The full structured dump can be very large; only build it when it is shown
+                if VERBOSE_OUTPUT or logger.isEnabledFor(logging.DEBUG):
+                    event_json = event_data.model_dump_json(indent=2)
+                    logger.debug("Step 4c Result (Structured Events):\n%s", event_json)
+                    if VERBOSE_OUTPUT:
+                        print(
+                            "\n--- Event Types Identified (Structured Output from Step 4c) ---"
+                        )
+                        print(event_json)
 
                 # Save results
                 logger.info("Saving event type identifier output to file...")
@@ -173,20 +182,13 @@ async def identify_event_types(
                 event_type_output_content = {
                     "primary_domain": event_data.primary_domain,
                     "analyzed_sub_domains": event_data.analyzed_sub_domains,
-                    "identified_events": [
-                        item.model_dump() for item in event_data.identified_events
-                    ],
+                    "identified_events": event_data.model_dump()["identified_events"],
                     "analysis_summary": event_data.analysis_summary,
                     "analysis_details": {
                         "source_text_length": len(content),
                         "primary_domain_context": primary_domain,
-                        "sub_domain_context_count": len(
-                            sub_domain_data.identified_sub_domains
-                        ),
-                        "topic_context_count": sum(
-                            len(t.identified_topics)
-                            for t in topic_data.sub_domain_topic_map
-                        ),
+                        "sub_domain_context_count": len(input_sub_domain_names),
+                        "topic_context_count": topic_count,
                         "model_used": EVENT_TYPE_MODEL,
                         "agent_name": event_type_identifier_agent.name,
                         "output_schema": EventTypeSchema.__name__,
@@ -197,7 +199,9 @@ async def identify_event_types(
                         "notes": f"Generated by {event_type_identifier_agent.name} in Step 4c of workflow.",
                     },
                 }
-                save_result_step4c = direct_save_json_output(
+                # Write the file in a worker thread so the event loop is not blocked
+                save_result_step4c = await asyncio.to_thread(
+                    direct_save_json_output,
                     EVENT_TYPE_OUTPUT_DIR,
                     EVENT_TYPE_OUTPUT_FILENAME,
                     event_type_output_content,
@@ -25,9 +25,10 @@ from ..schemas import (
     TopicSchema,
 )  # Import new output schema
 from ..utils import (
+    cached_run_agent_with_retry,
     direct_save_json_output,
-    run_agent_with_retry,
     score_measurement_types,
+    full_text_block,
 )
 
 logger = logging.getLogger(__name__)
@@ -110,12 +111,12 @@ async def identify_measurement_types(
         },
         {
             "role": "user",
-            "content": f"--- Full Text Start ---\n{content}\n--- Full Text End ---",
+            "content": full_text_block(content),
         },
     ]
 
     try:
-        step4f_result = await run_agent_with_retry(
+        step4f_result = await cached_run_agent_with_retry(
             agent=measurement_type_identifier_agent,
             input_data=step4f_input_list,
             config=step4f_run_config,
@@ -171,13 +172,15 @@ async def identify_measurement_types(
                 logger.info(
                     f"Step 4f Result: Identified Measurement Types = [{', '.join(measurement_log_items)}]"
                 )
+                # Serialize once for both the log record and the console
+                measurement_json = measurement_data.model_dump_json(indent=2)
                 logger.info(
-                    f"Step 4f Result (Structured Measurements):\n{measurement_data.model_dump_json(indent=2)}"
+                    "Step 4f Result (Structured Measurements):\n%s", measurement_json
                 )
                 print(
                     "\n--- Measurement Types Identified (Structured Output from Step 4f) ---"
                 )
-                print(measurement_data.model_dump_json(indent=2))
+                print(measurement_json)
 
                 # Save results
                 logger.info("Saving measurement type identifier output to file...")
@@ -185,9 +188,8 @@ async def identify_measurement_types(
                 measurement_type_output_content = {
                     "primary_domain": measurement_data.primary_domain,
                     "analyzed_sub_domains": measurement_data.analyzed_sub_domains,
-                    "identified_measurements": [
-                        item.model_dump()
-                        for item in measurement_data.identified_measurements
+                    "identified_measurements": measurement_data.model_dump()[
+                        "identified_measurements"
                     ],
                     "analysis_summary": measurement_data.analysis_summary,
                     "analysis_details": {
@@ -25,9 +25,10 @@ from ..schemas import (
     TopicSchema,
 )  # Import new output schema
 from ..utils import (
+    cached_run_agent_with_retry,
     direct_save_json_output,
-    run_agent_with_retry,
     score_modality_types,
+    full_text_block,
 )
 
 logger = logging.getLogger(__name__)
@@ -110,12 +111,12 @@ async def identify_modality_types(
         },
         {
             "role": "user",
-            "content": f"--- Full Text Start ---\n{content}\n--- Full Text End ---",
+            "content": full_text_block(content),
         },
     ]
 
     try:
-        step4g_result = await run_agent_with_retry(
+        step4g_result = await cached_run_agent_with_retry(
             agent=modality_type_identifier_agent,
             input_data=step4g_input_list,
             config=step4g_run_config,
@@ -168,13 +169,15 @@ async def identify_modality_types(
                 logger.info(
                     f"Step 4g Result: Identified Modality Types = [{', '.join(modality_log_items)}]"
                 )
+                # Serialize once for both the log record and the console
+                modality_json = modality_data.model_dump_json(indent=2)
                 logger.info(
-                    f"Step 4g Result (Structured Modalities):\n{modality_data.model_dump_json(indent=2)}"
+                    "Step 4g Result (Structured Modalities):\n%s", modality_json
                 )
                 print(
                     "\n--- Modality Types Identified (Structured Output from Step 4g) ---"
                 )
-                print(modality_data.model_dump_json(indent=2))
+                print(modality_json)
 
                 # Save results
                 logger.info("Saving modality type identifier output to file...")
@@ -182,9 +185,8 @@ async def identify_modality_types(
                 modality_type_output_content = {
                     "primary_domain": modality_data.primary_domain,
                     "analyzed_sub_domains": modality_data.analyzed_sub_domains,
-                    "identified_modalities": [
-                        item.model_dump()
-                        for item in modality_data.identified_modalities
+                    "identified_modalities": modality_data.model_dump()[
+                        "identified_modalities"
                     ],
                     "analysis_summary": modality_data.analysis_summary,
                     "analysis_details": {
@@ -24,6 +24,7 @@ from ..utils import (
     direct_save_json_output,
     run_agent_with_retry,
     score_entity_instances,
+    full_text_block,
 )
 
 logger = logging.getLogger(__name__)
@@ -94,7 +95,7 @@ async def identify_entity_instances(
         },
         {
             "role": "user",
-            "content": f"--- Full Text Start ---\n{content}\n--- Full Text End ---",
+            "content": full_text_block(content),
         },
     ]
 
@@ -19,6 +19,7 @@ from ..utils import (
     direct_save_json_output,
     run_agent_with_retry,
     score_event_instances,
+    full_text_block,
 )
 
 logger = logging.getLogger(__name__)
@@ -89,7 +90,7 @@ async def identify_event_instances(
         },
         {
             "role": "user",
-            "content": f"--- Full Text Start ---\n{content}\n--- Full Text End ---",
+            "content": full_text_block(content),
         },
     ]
 
@@ -22,7 +22,7 @@ from ..schemas import (
     TopicSchema,
     EntityTypeSchema,
 )
-from ..utils import direct_save_json_output, run_agent_with_retry
+from ..utils import direct_save_json_output, run_agent_with_retry, full_text_block
 
 logger = logging.getLogger(__name__)
 
@@ -165,7 +165,7 @@ async def identify_relationship_types(
             },
             {
                 "role": "user",
-                "content": f"--- Full Text Start ---\n{content}\n--- Full Text End ---",
+                "content": full_text_block(content),
             },
         ]
 
@@ -338,7 +338,7 @@ async def identify_relationship_types(
     )
 
     # Store final aggregated data
-    relationship_data = RelationshipSchema(
+    relationship_data = RelationshipSchema.trusted(
         primary_domain=primary_domain,
         analyzed_sub_domains=[
             sd.sub_domain for sd in sub_domain_data.identified_sub_domains
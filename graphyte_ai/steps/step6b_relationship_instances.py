@@ -19,7 +19,7 @@ from ..schemas import (
     SubDomainSchema,
     RelationshipSchema,
 )
-from ..utils import direct_save_json_output, run_agent_with_retry
+from ..utils import direct_save_json_output, run_agent_with_retry, full_text_block
 
 logger = logging.getLogger(__name__)
 
@@ -79,7 +79,7 @@ async def identify_relationship_instances(
         },
         {
             "role": "user",
-            "content": f"--- Full Text Start ---\n{content}\n--- Full Text End ---",
+            "content": full_text_block(content),
         },
     ]
 
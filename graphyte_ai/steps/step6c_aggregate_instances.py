@@ -47,7 +47,7 @@ def aggregate_extracted_instances(
         )
         return None
 
-    aggregated = ExtractedInstancesSchema(
+    aggregated = ExtractedInstancesSchema.trusted(
         primary_domain=primary_domain,
         analyzed_sub_domains=[
             sd.sub_domain for sd in sub_domain_data.identified_sub_domains
@@ -81,37 +81,25 @@ def aggregate_extracted_instances(
         ),
     )
 
-    logger.info(
-        "Aggregated extracted instances:\n%s",
-        aggregated.model_dump_json(indent=2),
-    )
+    # Serialize once for both the log record and the console
+    aggregated_json = aggregated.model_dump_json(indent=2)
+    logger.info("Aggregated extracted instances:\n%s", aggregated_json)
     print("\n--- Aggregated Extracted Instances ---")
-    print(aggregated.model_dump_json(indent=2))
+    print(aggregated_json)
 
-    output_content = {
-        "primary_domain": aggregated.primary_domain,
-        "analyzed_sub_domains": aggregated.analyzed_sub_domains,
-        "entity_instances": [i.model_dump() for i in aggregated.entity_instances],
-        "ontology_instances": [i.model_dump() for i in aggregated.ontology_instances],
-        "event_instances": [i.model_dump() for i in aggregated.event_instances],
-        "statement_instances": [i.model_dump() for i in aggregated.statement_instances],
-        "evidence_instances": [i.model_dump() for i in aggregated.evidence_instances],
-        "measurement_instances": [
-            i.model_dump() for i in aggregated.measurement_instances
-        ],
-        "modality_instances": [i.model_dump() for i in aggregated.modality_instances],
-        "relationship_instances": [
-            i.model_dump() for i in aggregated.relationship_instances
-        ],
-        "analysis_summary": aggregated.analysis_summary,
-        "analysis_details": {
-            "timestamp_utc": datetime.now(timezone.utc).isoformat(),
-        },
-        "trace_information": {
-            "trace_id": trace_id or "N/A",
-            "notes": "Aggregated from instance extraction steps",
-        },
-    }
+    # One serializer pass over the aggregate covers every instance list
+    output_content = aggregated.model_dump()
+    output_content.update(
+        {
+            "analysis_details": {
+                "timestamp_utc": datetime.now(timezone.utc).isoformat(),
+            },
+            "trace_information": {
+                "trace_id": trace_id or "N/A",
+                "notes": "Aggregated from instance extraction steps",
+            },
+        }
+    )
 
     save_result = direct_save_json_output(
         AGGREGATED_INSTANCE_OUTPUT_DIR,
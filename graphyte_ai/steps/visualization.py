@@ -1,5 +1,6 @@
 """Visualization functionality for agent workflow."""
 
+import asyncio
 import logging
 import sys
 from typing import Optional
@@ -40,7 +41,11 @@ except ImportError:
 async def generate_workflow_visualization(
     trace_id: Optional[str] = None, group_id: Optional[str] = None
 ) -> None:
-    """Generates a visualization of the defined agent structure and saves it."""
+    """Generates a visualization of the defined agent structure and saves it.
+
+    Directory creation and graph rendering (which may shell out to Graphviz)
+    run in a worker thread so the event loop stays responsive.
+    """
     if not VIZ_AVAILABLE:
         # Error message already printed by dummy draw_graph or import failure logged
         print("Skipping visualization generation due to missing dependencies.")
@@ -51,7 +56,9 @@ async def generate_workflow_visualization(
 
     # Ensure the output directory exists
     try:
-        VISUALIZATION_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+        await asyncio.to_thread(
+            VISUALIZATION_OUTPUT_DIR.mkdir, parents=True, exist_ok=True
+        )
         logger.debug(
             f"Ensured visualization output directory exists: {VISUALIZATION_OUTPUT_DIR}"
         )
@@ -89,8 +96,8 @@ async def generate_workflow_visualization(
         print(f"Attempting to save graph to: {output_path}")
 
         # Generate and save the graph
-        graph = draw_graph(
-            agent_to_visualize, filename=str(output_path)
+        graph = await asyncio.to_thread(
+            draw_graph, agent_to_visualize, filename=str(output_path)
         )  # Pass filename directly
 
         if graph:  # draw_graph might return the graph object or None on failure
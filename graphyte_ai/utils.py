@@ -1,12 +1,30 @@
 import argparse
 import asyncio
+import atexit
+import hashlib
 import json
 import logging
+import logging.handlers
+import queue
 import sys
+import time
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union, cast
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+)
 
-from pydantic import ValidationError
+from pydantic import BaseModel, ValidationError
 
 # Conditional Imports for Optional Features
 try:
@@ -21,6 +39,8 @@ try:
         retry,
         stop_after_attempt,
         wait_exponential,
+        wait_random,
+        retry_if_exception,
         retry_if_exception_type,
     )
 
@@ -28,6 +48,13 @@ try:
 except ImportError:
     TENACITY_AVAILABLE = False
 
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # NOTE: Using the external ``agents`` SDK
 try:
     from agents import (  # type: ignore[attr-defined]
@@ -44,9 +71,14 @@ except ImportError:
 
 # Import config constants needed in utils
 from .config import (
+    AGENT_RATE_LIMIT_PER_MIN,
     LOGS_DIR,
     PROJECT_ROOT,
     BINARY_FILE_EXTENSIONS,
+    RESULT_CACHE_ENABLED,
+    SAVE_INTERMEDIATE_OUTPUTS,
+    TOPIC_CACHE_DIR,
+    AGENT_CACHE_DIR,
 )
 from .workflow_agents import (
     confidence_score_agent,
@@ -60,6 +92,7 @@ from .schemas import (
     SubDomainSchema,
     TopicSchema,
     TopicDetail,
+    SingleSubDomainTopicSchema,
     EntityTypeSchema,
     OntologyTypeSchema,
     EventTypeSchema,
@@ -81,8 +114,26 @@ logger = logging.getLogger(__name__)
 
 
 # --- Logging Setup ---
+# Background listener that owns the real (blocking) handlers; see setup_logging
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _stop_log_listener() -> None:
+    """Flushes queued log records and stops the background logging listener."""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+
 def setup_logging():
-    """Configures logging for the application."""
+    """Configures logging for the application.
+
+    Log records are put on an in-memory queue by the root logger and written
+    to the log file and console by a background ``QueueListener`` thread, so
+    logging calls made from coroutines never block the event loop on I/O.
+    """
+    global _log_listener
     # Ensure the logs directory exists
     LOGS_DIR.mkdir(exist_ok=True)
     # Define the log file path
@@ -92,20 +143,30 @@ def setup_logging():
     if root_logger.hasHandlers():
         for handler in root_logger.handlers[:]:
             root_logger.removeHandler(handler)
+    _stop_log_listener()
 
-    # Configure logging to write to both file and console
-    logging.basicConfig(
-        level=logging.INFO,  # Set the minimum logging level (e.g., INFO, DEBUG)
-        format="%(asctime)s [%(levelname)s] %(name)s [%(filename)s:%(lineno)d]: %(message)s",
-        handlers=[
-            logging.FileHandler(
-                log_file, mode="a", encoding="utf-8"
-            ),  # Append to log file
-            logging.StreamHandler(),  # Output to console (stderr by default)
-        ],
-        # Force=True might be useful in some complex scenarios, but avoid if possible
-        # force=True
+    # Real handlers write to both file and console from the listener thread
+    formatter = logging.Formatter(
+        "%(asctime)s [%(levelname)s] %(name)s [%(filename)s:%(lineno)d]: %(message)s"
     )
+    output_handlers: List[logging.Handler] = [
+        logging.FileHandler(log_file, mode="a", encoding="utf-8"),  # Append to log file
+        logging.StreamHandler(),  # Output to console (stderr by default)
+    ]
+    for handler in output_handlers:
+        handler.setFormatter(formatter)
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    # Set the minimum logging level (e.g., INFO, DEBUG)
+    root_logger.setLevel(logging.INFO)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    _log_listener = logging.handlers.QueueListener(
+        log_queue, *output_handlers, respect_handler_level=True
+    )
+    _log_listener.start()
+    # Drain the queue on interpreter exit; unregister first so repeated calls add one hook
+    atexit.unregister(_stop_log_listener)
+    atexit.register(_stop_log_listener)
     logger.info(f"Logging configured. Log file: {log_file}")
 
 
@@ -138,6 +199,11 @@ def parse_arguments() -> argparse.Namespace:
         action="store_true",
         help="Generate a visualization of the agent workflow structure and exit.",
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Run the workflow even if the input exceeds the hard size limit.",
+    )
     return parser.parse_args()
 
 
@@ -201,18 +267,20 @@ def read_input_from_file(file_path: Path) -> str:
             raise IOError(f"Error reading file {file_path}: {e}") from e
 
 
-def read_input_from_directory(dir_path: Path) -> str:
-    """Reads and combines content from readable files (including PDFs) in a directory."""
+def _list_directory_files(dir_path: Path) -> Tuple[List[Path], int, int]:
+    """Lists the readable files in ``dir_path`` in sorted order.
+
+    Returns the files to read plus the number of files checked and the number
+    skipped as binary. Subdirectories and other entries are logged and skipped.
+    """
     if not dir_path.is_dir():
         logger.error(f"Input path is not a valid directory: {dir_path}")
         raise NotADirectoryError(f"Input path is not a valid directory: {dir_path}")
 
     logger.info(f"Reading input from directory: {dir_path}")
-    combined_content = []
-    file_count = 0
+    files_to_read: List[Path] = []
     processed_files = 0
     skipped_binary = 0
-    read_errors = 0
 
     try:
         files_to_process = sorted(list(dir_path.iterdir()))
@@ -232,34 +300,55 @@ def read_input_from_directory(dir_path: Path) -> str:
                 )
                 skipped_binary += 1
                 continue
-            try:
-                logger.debug(f"Processing file: {item_path}")
-                text = read_input_from_file(item_path)
-                if text and text.strip():
-                    combined_content.append(
-                        f"\n\n--- Content from: {item_path.name} ---\n\n{text}"
-                    )
-                    file_count += 1
-                elif text is not None:
-                    logger.debug(
-                        f"File {item_path.name} resulted in empty or whitespace-only content."
-                    )
-                # Else: read_input_from_file would raise an error if None/failure
-
-            except (IOError, ImportError, Exception) as e:
-                read_errors += 1
-                logger.warning(
-                    f"Could not read or process file {item_path.name}: {type(e).__name__}: {e}"
-                )
-                if isinstance(e, ImportError):
-                    logger.error(
-                        f"ImportError likely due to missing dependency for {item_path.name}"
-                    )
+            files_to_read.append(item_path)
         elif item_path.is_dir():
             logger.info(f"Skipping subdirectory: {item_path.name}")
         else:
             logger.warning(f"Skipping non-file/non-directory item: {item_path.name}")
 
+    return files_to_read, processed_files, skipped_binary
+
+
+def _read_directory_file(item_path: Path) -> str:
+    """Reads one directory file, returning its labelled content block or ``""``."""
+    logger.debug(f"Processing file: {item_path}")
+    text = read_input_from_file(item_path)
+    if text and text.strip():
+        return f"\n\n--- Content from: {item_path.name} ---\n\n{text}"
+    logger.debug(f"File {item_path.name} resulted in empty or whitespace-only content.")
+    return ""
+
+
+def _collect_directory_result(
+    item_path: Path, result: Union[str, BaseException], combined_content: List[str]
+) -> bool:
+    """Appends one per-file result to ``combined_content``.
+
+    Returns ``True`` if the result was a read error (which is logged).
+    """
+    if isinstance(result, BaseException):
+        logger.warning(
+            f"Could not read or process file {item_path.name}: {type(result).__name__}: {result}"
+        )
+        if isinstance(result, ImportError):
+            logger.error(
+                f"ImportError likely due to missing dependency for {item_path.name}"
+            )
+        return True
+    if result:
+        combined_content.append(result)
+    return False
+
+
+def _finish_directory_content(
+    dir_path: Path,
+    combined_content: List[str],
+    read_errors: int,
+    processed_files: int,
+    skipped_binary: int,
+) -> str:
+    """Joins the collected per-file blocks, logging a summary."""
+    file_count = len(combined_content)
     if file_count == 0:
         logger.warning(
             f"No readable text files (or extractable PDFs) found or processed in directory: {dir_path} (out of {processed_files} items checked; {skipped_binary} skipped as binary; {read_errors} read errors)."
@@ -269,6 +358,73 @@ def read_input_from_directory(dir_path: Path) -> str:
     return "\n".join(combined_content)
 
 
+def read_input_from_directory(dir_path: Path) -> str:
+    """Reads and combines content from readable files (including PDFs) in a directory."""
+    files_to_read, processed_files, skipped_binary = _list_directory_files(dir_path)
+
+    combined_content: List[str] = []
+    read_errors = 0
+    for item_path in files_to_read:
+        result: Union[str, BaseException]
+        try:
+            result = _read_directory_file(item_path)
+        except Exception as e:
+            result = e
+        read_errors += _collect_directory_result(item_path, result, combined_content)
+
+    return _finish_directory_content(
+        dir_path, combined_content, read_errors, processed_files, skipped_binary
+    )
+
+
+async def iter_directory_files_async(
+    files_to_read: List[Path],
+) -> AsyncIterator[Tuple[Path, Union[str, BaseException]]]:
+    """Yields ``(path, content_block_or_error)`` for each file as it becomes available.
+
+    All reads are started at once in worker threads, but results are yielded in
+    the given (sorted) order so callers can consume each file while the slower
+    ones are still being read, without holding every result until the end.
+    """
+    tasks = [
+        asyncio.ensure_future(asyncio.to_thread(_read_directory_file, p))
+        for p in files_to_read
+    ]
+    try:
+        for item_path, task in zip(files_to_read, tasks):
+            result: Union[str, BaseException]
+            try:
+                result = await task
+            except Exception as e:
+                result = e
+            yield item_path, result
+    finally:
+        # Abandoned iteration: drop any reads that have not started yet
+        for task in tasks:
+            task.cancel()
+
+
+async def read_input_from_directory_async(dir_path: Path) -> str:
+    """Async variant of :func:`read_input_from_directory`.
+
+    Files are read concurrently in worker threads so the event loop is not
+    blocked, and are consumed one at a time via :func:`iter_directory_files_async`.
+    The combined content keeps the sorted directory order.
+    """
+    files_to_read, processed_files, skipped_binary = await asyncio.to_thread(
+        _list_directory_files, dir_path
+    )
+
+    combined_content: List[str] = []
+    read_errors = 0
+    async for item_path, result in iter_directory_files_async(files_to_read):
+        read_errors += _collect_directory_result(item_path, result, combined_content)
+
+    return _finish_directory_content(
+        dir_path, combined_content, read_errors, processed_files, skipped_binary
+    )
+
+
 def prompt_user_for_input() -> str:
     """Prompts the user to enter text via standard input (stdin)."""
     print("\nNo --file or --dir specified. Please enter your input text below.")
@@ -287,11 +443,169 @@ def prompt_user_for_input() -> str:
         return ""
 
 
+# --- Prompt Helpers ---
+@lru_cache(maxsize=2)
+def full_text_block(content: str) -> str:
+    """Wraps the document in the full-text markers used by every step prompt.
+
+    The result is cached so the (potentially large) wrapped copy is built once
+    per workflow run instead of once per agent call. Two slots hold both the
+    full document and the shortened Step 4d/4e excerpt (TYPE_ID_MAX_PROMPT_CHARS)
+    while the Step 4 group runs concurrently. The orchestrator clears the
+    cache when a run ends so the document is not kept alive afterwards.
+    """
+    return f"--- Full Text Start ---\n{content}\n--- Full Text End ---"
+
+
+def head_tail_excerpt(content: str, max_chars: int) -> str:
+    """Shortens text to about ``max_chars`` by keeping its beginning and end.
+
+    The first three quarters of the budget come from the start of the text and
+    the rest from the end, joined by a marker noting how much was left out.
+    Text within the limit, or any text when ``max_chars`` is 0, is returned
+    unchanged.
+    """
+    if max_chars <= 0 or len(content) <= max_chars:
+        return content
+    head_chars = max_chars * 3 // 4
+    tail_chars = max_chars - head_chars
+    omitted = len(content) - head_chars - tail_chars
+    return (
+        f"{content[:head_chars]}\n"
+        f"[... {omitted} characters omitted ...]\n"
+        f"{content[len(content) - tail_chars:]}"
+    )
+
+
+# --- Result Cache ---
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def content_fingerprint(content: str) -> str:
+    """Returns a stable SHA-256 hex digest of the input text for cache keys."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _load_cached_model(cache_path: Path, schema: Type[ModelT]) -> Optional[ModelT]:
+    """Reads and validates one cache entry, or returns None on a miss or bad entry."""
+    try:
+        raw = cache_path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        logger.warning(f"Could not read cache entry {cache_path}: {e}")
+        return None
+    try:
+        return schema.model_validate_json(raw)
+    except ValidationError as e:
+        logger.warning(f"Ignoring invalid cache entry {cache_path}: {e}")
+        return None
+
+
+def _store_cached_model(cache_path: Path, data: BaseModel) -> None:
+    """Writes one cache entry; failures are logged and otherwise ignored."""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(data.model_dump_json(), encoding="utf-8")
+    except OSError as e:
+        logger.warning(f"Could not write cache entry {cache_path}: {e}")
+
+
+@lru_cache(maxsize=None)
+def _output_schema_fingerprint(output_type: Any) -> str:
+    """Returns a SHA-256 digest of an agent output type's JSON schema."""
+    if isinstance(output_type, type) and issubclass(output_type, BaseModel):
+        schema_text = json.dumps(output_type.model_json_schema(), sort_keys=True)
+    else:
+        schema_text = str(output_type)
+    return hashlib.sha256(schema_text.encode("utf-8")).hexdigest()
+
+
+def _agent_cache_identity(agent: Agent) -> List[str]:
+    """Agent settings that shape its output, included in every result cache key.
+
+    Editing an agent's instructions, model or output schema changes the key, so
+    results produced under the old definition are not reused.
+    """
+    return [
+        agent.name,
+        str(getattr(agent, "model", "")),
+        str(getattr(agent, "instructions", "")),
+        _output_schema_fingerprint(getattr(agent, "output_type", None)),
+    ]
+
+
+def _topic_cache_path(
+    primary_domain: str,
+    sub_domain: str,
+    model: str,
+    content_hash: str,
+    agent: Agent,
+    prompt_template: str,
+) -> Path:
+    # The agent identity and prompt template keep single and batched topic
+    # results apart, and entries made under older prompts are not reused
+    key = json.dumps(
+        [
+            primary_domain,
+            sub_domain.strip().lower(),
+            model,
+            content_hash,
+            *_agent_cache_identity(agent),
+            prompt_template,
+        ],
+        ensure_ascii=False,
+    )
+    return TOPIC_CACHE_DIR / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.json"
+
+
+def load_cached_topics(
+    primary_domain: str,
+    sub_domain: str,
+    model: str,
+    content_hash: str,
+    agent: Agent,
+    prompt_template: str,
+) -> Optional[SingleSubDomainTopicSchema]:
+    """Returns the cached Step 3 result for a sub-domain, or None on a cache miss.
+
+    ``agent`` and ``prompt_template`` are the topic agent and instruction
+    template that would produce the result; entries from others do not match.
+    """
+    return _load_cached_model(
+        _topic_cache_path(
+            primary_domain, sub_domain, model, content_hash, agent, prompt_template
+        ),
+        SingleSubDomainTopicSchema,
+    )
+
+
+def store_cached_topics(
+    primary_domain: str,
+    sub_domain: str,
+    model: str,
+    content_hash: str,
+    agent: Agent,
+    prompt_template: str,
+    topic_data: SingleSubDomainTopicSchema,
+) -> None:
+    """Writes a Step 3 result for a sub-domain to the topic cache."""
+    _store_cached_model(
+        _topic_cache_path(
+            primary_domain, sub_domain, model, content_hash, agent, prompt_template
+        ),
+        topic_data,
+    )
+
+
 # --- Helper Function to Save JSON Output ---
 def direct_save_json_output(
     output_dir: Path, filename: str, content: Dict[str, Any], trace_id: Optional[str]
 ) -> str:
     """Saves the provided dictionary content as a JSON file in the designated output directory."""
+    if not SAVE_INTERMEDIATE_OUTPUTS:
+        return f"Skipped saving {filename}: SAVE_INTERMEDIATE_OUTPUTS is disabled."
+
     safe_filename = Path(filename).name
     if not safe_filename:
         default_filename = f"output_{trace_id or 'unknown_trace'}.json"
@@ -315,8 +629,16 @@ def direct_save_json_output(
 
     output_path = output_dir / safe_filename
     try:
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(content, f, indent=2, ensure_ascii=False)
+        if ORJSON_AVAILABLE:
+            # orjson writes UTF-8 directly, matching ensure_ascii=False below
+            output_path.write_bytes(
+                orjson.dumps(
+                    content, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                )
+            )
+        else:
+            with open(output_path, "w", encoding="utf-8") as f:
+                json.dump(content, f, indent=2, ensure_ascii=False)
 
         try:
             relative_output_dir = output_dir.relative_to(PROJECT_ROOT)
@@ -348,14 +670,82 @@ def direct_save_json_output(
         return f"Error saving data to {safe_filename}: {e}"
 
 
+# --- Rate Limiting ---
+class _AgentRateLimiter:
+    """Spaces agent runs across the whole workflow and adapts to rate limit errors.
+
+    Every run takes the next free start slot, so concurrent steps share one budget
+    of ``AGENT_RATE_LIMIT_PER_MIN`` runs per minute. A rate limit error halves the
+    rate for all callers, and each successful run adds a little back until the
+    configured rate is reached again. A rate of 0 disables limiting.
+    """
+
+    def __init__(self, rate_per_min: int) -> None:
+        self.max_rate = float(rate_per_min)
+        self.rate = self.max_rate
+        self._next_slot = 0.0
+
+    async def acquire(self) -> None:
+        if self.max_rate <= 0:
+            return
+        now = time.monotonic()
+        start = max(now, self._next_slot)
+        self._next_slot = start + 60.0 / self.rate
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    def on_rate_limited(self) -> None:
+        if self.max_rate <= 0:
+            return
+        self.rate = max(1.0, self.rate / 2)
+        logger.warning(
+            f"Rate limit hit; reducing shared agent run rate to {self.rate:.1f}/min."
+        )
+
+    def on_success(self) -> None:
+        if self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + max(1.0, self.max_rate / 20))
+
+
+_agent_rate_limiter = _AgentRateLimiter(AGENT_RATE_LIMIT_PER_MIN)
+
+
+def _is_rate_limit_error(exc: BaseException) -> bool:
+    """True for provider HTTP 429 errors (e.g. ``openai.RateLimitError``)."""
+    return getattr(exc, "status_code", None) == 429
+
+
+async def _run_agent_once(
+    agent: Agent,
+    input_data: Union[str, List[TResponseInputItem]],
+    config: Optional[RunConfig],
+) -> RunResult:
+    """Runs an agent once within the shared rate limit."""
+    await _agent_rate_limiter.acquire()
+    try:
+        result = await Runner.run(
+            starting_agent=agent, input=input_data, run_config=config
+        )
+    except Exception as e:
+        if _is_rate_limit_error(e):
+            _agent_rate_limiter.on_rate_limited()
+        raise
+    _agent_rate_limiter.on_success()
+    return result
+
+
 # --- Retry Logic Setup ---
 # Define a retry decorator if the 'tenacity' library is available
 if TENACITY_AVAILABLE:
     logger.info("Tenacity library found. Enabling retry logic for agent runs.")
     retry_decorator = retry(
         stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((AgentsException, asyncio.TimeoutError)),
+        # Random jitter keeps concurrent tasks from retrying in lockstep
+        wait=wait_exponential(multiplier=1, min=2, max=10) + wait_random(0, 1),
+        retry=(
+            retry_if_exception_type((AgentsException, asyncio.TimeoutError))
+            | retry_if_exception(_is_rate_limit_error)
+        ),
         reraise=True,
         before_sleep=lambda retry_state: logger.warning(
             f"Retrying agent run for {retry_state.args[0].name if retry_state.args else 'unknown agent'} after error: {retry_state.outcome.exception()}. Attempt {retry_state.attempt_number+1}..."
@@ -370,9 +760,7 @@ if TENACITY_AVAILABLE:
     ) -> RunResult:
         """Wrapper function to run an agent with configured retry logic."""
         logger.debug(f"Attempting to run agent '{agent.name}'...")
-        result = await Runner.run(
-            starting_agent=agent, input=input_data, run_config=config
-        )
+        result = await _run_agent_once(agent, input_data, config)
         logger.debug(f"Agent '{agent.name}' run successful.")
         return result
 
@@ -388,9 +776,64 @@ else:
     ) -> RunResult:
         """Placeholder function when tenacity is not available. Runs the agent once."""
         # No retry logic here, just call the runner directly.
-        return await Runner.run(
-            starting_agent=agent, input=input_data, run_config=config
-        )
+        return await _run_agent_once(agent, input_data, config)
+
+
+# --- Cached Agent Runs ---
+@dataclass
+class CachedRunResult:
+    """Stands in for a RunResult when an agent output comes from the result cache.
+
+    Steps only read ``final_output`` from run results, so that is all it carries.
+    """
+
+    final_output: Any
+
+
+def _agent_cache_path(
+    agent: Agent, input_data: Union[str, List[TResponseInputItem]]
+) -> Path:
+    # The input items hold the full text and all step context, and the agent
+    # identity covers its instructions and schema, so identical keys mean
+    # identical requests
+    key = json.dumps(
+        [*_agent_cache_identity(agent), input_data],
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return AGENT_CACHE_DIR / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.json"
+
+
+async def cached_run_agent_with_retry(
+    agent: Agent,
+    input_data: Union[str, List[TResponseInputItem]],
+    config: Optional[RunConfig] = None,
+) -> Union[RunResult, CachedRunResult]:
+    """Runs an agent like run_agent_with_retry, reusing outputs for identical inputs.
+
+    Only structured outputs of the agent's ``output_type`` are cached. With
+    RESULT_CACHE_ENABLED off this is exactly run_agent_with_retry.
+    """
+    output_type = getattr(agent, "output_type", None)
+    if not (
+        RESULT_CACHE_ENABLED
+        and isinstance(output_type, type)
+        and issubclass(output_type, BaseModel)
+    ):
+        return await run_agent_with_retry(agent, input_data, config)
+
+    cache_path = _agent_cache_path(agent, input_data)
+    cached_output = await asyncio.to_thread(_load_cached_model, cache_path, output_type)
+    if cached_output is not None:
+        logger.info(f"Using cached output for agent '{agent.name}'.")
+        return CachedRunResult(final_output=cached_output)
+
+    result = await run_agent_with_retry(agent, input_data, config)
+    final_output = getattr(result, "final_output", None)
+    if isinstance(final_output, output_type):
+        await asyncio.to_thread(_store_cached_model, cache_path, final_output)
+    return result
 
 
 # --- Parallel Scoring Utility ---
@@ -1,13 +1,16 @@
 # NOTE: Using the external ``agents`` SDK for agent definitions
-from typing import Any, cast, List
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, cast, List, Mapping
 
 try:
     from agents import Agent  # type: ignore[attr-defined]
-except ImportError:
-    print("Error: 'agents' SDK library not found or incomplete. Cannot define agents.")
-    # Depending on execution context, might want `sys.exit(1)` here,
-    # but typically module-level errors are handled by the importer.
-    Agent = Any  # type: ignore[misc]
+except ImportError as exc:
+    # Fail fast: every agent below is built at import time and a placeholder
+    # would only push the failure to the first run.
+    raise ImportError(
+        "'agents' SDK library not found or incomplete. Cannot define agents."
+    ) from exc
 
 from .schemas import (
     DomainSchema,
@@ -15,6 +18,7 @@ from .schemas import (
     SubDomainIdentifierSchema,
     SubDomainSchema,
     SingleSubDomainTopicIdentifierSchema,
+    TopicBatchIdentifierSchema,
     TopicSchema,
     EntityTypeSchema,
     OntologyTypeSchema,
@@ -56,71 +60,105 @@ from .config import (
     MODALITY_INSTANCE_MODEL,
     RELATIONSHIP_MODEL,
     RELATIONSHIP_INSTANCE_MODEL,
-    DEFAULT_MODEL,
+    SCORING_MODEL,
 )
 
-# --- Base Agent for Scoring ---
-# Template agent used for calculating confidence or relevance scores.
+# --- Scoring Agent Factory ---
+# Shared template for agents calculating confidence, relevance or clarity scores.
 base_scoring_instructions_template = (
     "Evaluate the provided {item_description} and assign a numeric {score_type} between 0.0 and 1.0. "
     "Use any available context to inform your assessment. "
     "Output ONLY JSON using the schema with the '{score_field}' field."
 )
 
-base_scoring_agent = Agent(
-    name="BaseScoringAgent",  # Generic name, overridden in clones
-    instructions=base_scoring_instructions_template,
-    tools=[],
-    handoffs=[],
-)
+
+@lru_cache(maxsize=None)
+def _scoring_instructions(
+    item_description: str, score_type: str, score_field: str
+) -> str:
+    """Format ``base_scoring_instructions_template`` once per argument tuple."""
+    return base_scoring_instructions_template.format(
+        item_description=item_description,
+        score_type=score_type,
+        score_field=score_field,
+    )
+
+
+def _make_scoring_agent(
+    name: str,
+    item_description: str,
+    score_type: str,
+    score_field: str,
+    output_type: Any,
+    model: str = SCORING_MODEL,
+) -> Agent:
+    """Build a scoring agent from ``base_scoring_instructions_template``."""
+    return Agent(
+        name=name,
+        instructions=_scoring_instructions(item_description, score_type, score_field),
+        model=model,
+        output_type=output_type,
+        tools=[],
+        handoffs=[],
+    )
+
 
 # --- Confidence Score Agent ---
-# Specialized clone of the base scoring agent used to assess
-# confidence in a domain classification or relationship instance.
-confidence_score_agent = base_scoring_agent.clone(
+# Scoring agent used to assess confidence in a domain classification
+# or relationship instance.
+confidence_score_agent = _make_scoring_agent(
     name="ConfidenceScoreAgent",
-    instructions=base_scoring_instructions_template.format(
-        item_description="domain or relationship instance",
-        score_type="confidence score ",
-        score_field="confidence_score",
-    ),
-    model=DEFAULT_MODEL,
+    item_description="domain or relationship instance",
+    score_type="confidence score ",
+    score_field="confidence_score",
     output_type=ConfidenceScoreSchema,
 )
 
 # --- Relevance Score Agent ---
-# Clone of the base scoring agent used to judge relevance of items like
-# sub-domains, topics, types, or relationship types.
-relevance_score_agent = base_scoring_agent.clone(
+# Scoring agent used to judge relevance of items like sub-domains,
+# topics, types, or relationship types.
+relevance_score_agent = _make_scoring_agent(
     name="RelevanceScoreAgent",
-    instructions=base_scoring_instructions_template.format(
-        item_description=(
-            "sub-domain, topic, entity/ontology/event/statement/evidence/"
-            "measurement/modality type, or relationship type"
-        ),
-        score_type="relevance score ",
-        score_field="relevance_score",
+    item_description=(
+        "sub-domain, topic, entity/ontology/event/statement/evidence/"
+        "measurement/modality type, or relationship type"
     ),
-    model=DEFAULT_MODEL,
+    score_type="relevance score ",
+    score_field="relevance_score",
     output_type=RelevanceScoreSchema,
 )
 
 # --- Clarity Score Agent ---
-# Clone of the base scoring agent used to assess clarity of text, relationships, or entities.
-clarity_score_agent = base_scoring_agent.clone(
+# Scoring agent used to assess clarity of text, relationships, or entities.
+clarity_score_agent = _make_scoring_agent(
     name="ClarityScoreAgent",
-    instructions=base_scoring_instructions_template.format(
-        item_description="text, relationship, or entity",
-        score_type="clarity score ",
-        score_field="clarity_score",
-    ),
-    model=DEFAULT_MODEL,
+    item_description="text, relationship, or entity",
+    score_type="clarity score ",
+    score_field="clarity_score",
     output_type=ClarityScoreSchema,
 )
 
+# --- Score Tools ---
+# Tool wrappers around the score agents, built once and shared by every
+# agent that is allowed to call them. Each entry is (agent, name, description).
+_SCORE_TOOL_DEFS = (
+    (
+        confidence_score_agent,
+        "confidence_score",
+        "Evaluate confidence between 0.0 and 1.0",
+    ),
+    (relevance_score_agent, "relevance_score", "Judge relevance between 0.0 and 1.0"),
+    (clarity_score_agent, "clarity_score", "Assess clarity between 0.0 and 1.0"),
+)
+SCORE_TOOLS = tuple(
+    agent.as_tool(tool_name=tool_name, tool_description=tool_description)
+    for agent, tool_name, tool_description in _SCORE_TOOL_DEFS
+)
+CONFIDENCE_TOOL, RELEVANCE_TOOL, CLARITY_TOOL = SCORE_TOOLS
+
 # --- Result Agent Helper ---
-# Allows cloning an existing agent to simply return a provided item
-# along with pre-calculated scores.
+# Derives an agent from an existing identifier that simply returns a provided
+# item along with pre-calculated scores.
 result_agent_instructions_template = (
     "You are provided with a {item_description} and pre-calculated confidence, "
     "relevance, and clarity scores. Do not recompute these values. "
@@ -130,12 +168,16 @@ result_agent_instructions_template = (
 
 
 def create_result_agent(base_agent: Agent, schema: Any, item_description: str) -> Agent:
-    """Clone ``base_agent`` and configure it to return a result with scores.
+    """Build a result agent for ``base_agent`` that returns a result with scores.
+
+    The new agent reuses the name and model of ``base_agent``; every other
+    setting is supplied explicitly, so it is constructed directly rather than
+    cloned.
 
     Parameters
     ----------
     base_agent : Agent
-        The agent instance to clone.
+        The identifier agent the result agent is derived from.
     schema : Any
         Output schema that the result should conform to.
     item_description : str
@@ -147,12 +189,13 @@ def create_result_agent(base_agent: Agent, schema: Any, item_description: str) -
         A new agent that echoes the provided result and scores.
     """
 
-    return base_agent.clone(
+    return Agent(
         name=base_agent.name.replace("Identifier", "Result"),
         instructions=result_agent_instructions_template.format(
             item_description=item_description,
             schema_name=schema.__name__,
         ),
+        model=base_agent.model,
         output_type=schema,
         tools=[],
         handoffs=[],
@@ -221,6 +264,21 @@ topic_identifier_agent = Agent(
     output_type=SingleSubDomainTopicIdentifierSchema,
 )
 
+# --- Agent 3 (batched): Topic Identifier for several sub-domains per call ---
+topic_batch_identifier_agent = Agent(
+    name="TopicBatchIdentifierAgent",
+    instructions=(
+        "You are provided with text, its primary domain, and a LIST of sub-domains. "
+        "Analyze the *full text* and, for EACH sub-domain separately, identify specific, relevant topics mentioned that fall under it. "
+        "Do NOT call any scoring tools.\n"
+        "Return ONLY valid JSON using the TopicBatchIdentifierSchema, with one result per sub-domain."
+    ),
+    model=TOPIC_MODEL,
+    tools=[],
+    handoffs=[],
+    output_type=TopicBatchIdentifierSchema,
+)
+
 # --- Agent 3b: Topic Result ---
 topic_result_agent = create_result_agent(
     base_agent=topic_identifier_agent,
@@ -229,9 +287,9 @@ topic_result_agent = create_result_agent(
 )
 
 
-# --- Base Agent for Type Identification (Agents 4a-4g) ---
-# This base agent provides a template for identifying various concept types.
-# It will be cloned and specialized for each specific type.
+# --- Type Identifier Factory (Agents 4a-4g) ---
+# Shared template for identifying various concept types, specialized per type
+# by ``_make_type_identifier_agent``.
 
 base_type_identifier_instructions_template = (
     "Your primary task: Analyze the provided text content to identify key {concept_description}. {specific_constraint} "
@@ -244,118 +302,150 @@ base_type_identifier_instructions_template = (
     "Output ONLY the result using the provided schema structure. Ensure the {list_field_name} field contains a list of items, each with '{item_field_name}'. Include the 'primary_domain' and 'analyzed_sub_domains' fields from the context in your output schema."
 )
 
-base_type_identifier_agent = Agent(
-    name="BaseTypeIdentifierAgent",  # Generic name, will be overridden
-    instructions=base_type_identifier_instructions_template,  # Will be formatted in clones
-    # No default model or output_type, must be specified in clones
-    tools=[],
-    handoffs=[],
-)
 
+@lru_cache(maxsize=None)
+def _type_identifier_instructions(
+    concept_description: str,
+    specific_constraint: str,
+    concept_type_singular: str,
+    list_field_name: str,
+    item_field_name: str,
+) -> str:
+    """Format ``base_type_identifier_instructions_template`` once per argument tuple."""
+    return base_type_identifier_instructions_template.format(
+        concept_description=concept_description,
+        specific_constraint=specific_constraint,
+        concept_type_singular=concept_type_singular,
+        list_field_name=list_field_name,
+        item_field_name=item_field_name,
+    )
 
-# --- Agent 4a: Entity Type Identifier ---
-entity_type_identifier_agent = base_type_identifier_agent.clone(
-    name="EntityTypeIdentifierAgent",
-    instructions=base_type_identifier_instructions_template.format(
-        concept_description="entity types (e.g., PERSON, ORGANIZATION, LOCATION, DATE, MONEY, PRODUCT, TECHNOLOGY, SCIENTIFIC_CONCEPT, ECONOMIC_INDICATOR)",
-        specific_constraint="Do NOT identify Event types - that is handled by another agent.",  # Retain original constraint
-        concept_type_singular="entity type",
-        list_field_name="identified_entities",
-        item_field_name="entity_type",
-    ),
-    model=ENTITY_TYPE_MODEL,
-    output_type=EntityTypeSchema,
-)
 
-# --- Agent 4b: Ontology Type Identifier ---
-ontology_type_identifier_agent = base_type_identifier_agent.clone(
-    name="OntologyTypeIdentifierAgent",
-    instructions=base_type_identifier_instructions_template.format(
-        concept_description="relevant ontology types or concepts, potentially referencing standard ontologies (like Schema.org, FIBO, domain-specific ones) where applicable",
-        specific_constraint="Focus on conceptual or taxonomic classifications, potentially referencing standard ontologies (like Schema.org, FIBO). Avoid simple entity labels.",  # Added constraint
-        concept_type_singular="ontology type/concept",
-        list_field_name="identified_ontology_types",
-        item_field_name="ontology_type",
-    ),
-    model=ONTOLOGY_TYPE_MODEL,
-    output_type=OntologyTypeSchema,
-)
+def _make_type_identifier_agent(
+    name: str,
+    concept_description: str,
+    specific_constraint: str,
+    concept_type_singular: str,
+    list_field_name: str,
+    item_field_name: str,
+    model: str,
+    output_type: Any,
+) -> Agent:
+    """Build a type identifier from ``base_type_identifier_instructions_template``."""
+    return Agent(
+        name=name,
+        instructions=_type_identifier_instructions(
+            concept_description,
+            specific_constraint,
+            concept_type_singular,
+            list_field_name,
+            item_field_name,
+        ),
+        model=model,
+        output_type=output_type,
+        tools=[],
+        handoffs=[],
+    )
 
-# --- Agent 4c: Event Type Identifier ---
-event_type_identifier_agent = base_type_identifier_agent.clone(
-    name="EventTypeIdentifierAgent",
-    instructions=base_type_identifier_instructions_template.format(
-        concept_description="key EVENT types (e.g., Meeting, Acquisition, Conference, Product Launch, Election, Natural Disaster, Release, Protest, Accident, Celebration)",
-        specific_constraint="Do NOT identify other entity types like Person, Organization, Location etc. - focus ONLY on events.",  # Retain original constraint
-        concept_type_singular="event type",
-        list_field_name="identified_events",
-        item_field_name="event_type",
-    ),
-    model=EVENT_TYPE_MODEL,
-    output_type=EventTypeSchema,
-)
 
-# --- Agent 4d: Statement Type Identifier ---
-statement_type_identifier_agent = base_type_identifier_agent.clone(
-    name="StatementTypeIdentifierAgent",
-    instructions=base_type_identifier_instructions_template.format(
-        concept_description="key STATEMENT types (e.g., Fact, Claim, Opinion, Question, Instruction, Hypothesis, Prediction)",
-        specific_constraint="Focus only on classifying the nature or type of the statement (e.g., Fact, Opinion, Claim, Hypothesis), not its specific content or truth value.",  # Added constraint
-        concept_type_singular="statement type",
-        list_field_name="identified_statements",
-        item_field_name="statement_type",
+# --- Agents 4a-4g: Type Identifiers ---
+# One record per agent, in ``_make_type_identifier_agent`` argument order:
+# (name, concept_description, specific_constraint, concept_type_singular,
+#  list_field_name, item_field_name, model, output_type)
+TYPE_AGENT_SPECS = (
+    (
+        "EntityTypeIdentifierAgent",
+        "entity types (e.g., PERSON, ORGANIZATION, LOCATION, DATE, MONEY, PRODUCT, TECHNOLOGY, SCIENTIFIC_CONCEPT, ECONOMIC_INDICATOR)",
+        "Do NOT identify Event types - that is handled by another agent.",
+        "entity type",
+        "identified_entities",
+        "entity_type",
+        ENTITY_TYPE_MODEL,
+        EntityTypeSchema,
     ),
-    model=STATEMENT_TYPE_MODEL,
-    output_type=StatementTypeSchema,
-)
-
-# --- Agent 4e: Evidence Type Identifier ---
-evidence_type_identifier_agent = base_type_identifier_agent.clone(
-    name="EvidenceTypeIdentifierAgent",
-    instructions=base_type_identifier_instructions_template.format(
-        concept_description="key types of EVIDENCE presented (e.g., Testimony, Document Reference, Statistic, Anecdote, Expert Opinion, Observation, Example, Case Study, Logical Argument)",
-        specific_constraint="Focus on the *form* or *category* of evidence used to support claims or statements (e.g., Statistic, Testimony, Document Reference).",  # Added constraint
-        concept_type_singular="evidence type",
-        list_field_name="identified_evidence",
-        item_field_name="evidence_type",
+    (
+        "OntologyTypeIdentifierAgent",
+        "relevant ontology types or concepts, potentially referencing standard ontologies (like Schema.org, FIBO, domain-specific ones) where applicable",
+        "Focus on conceptual or taxonomic classifications, potentially referencing standard ontologies (like Schema.org, FIBO). Avoid simple entity labels.",
+        "ontology type/concept",
+        "identified_ontology_types",
+        "ontology_type",
+        ONTOLOGY_TYPE_MODEL,
+        OntologyTypeSchema,
     ),
-    model=EVIDENCE_TYPE_MODEL,
-    output_type=EvidenceTypeSchema,
-)
-
-# --- Agent 4f: Measurement Type Identifier ---
-measurement_type_identifier_agent = base_type_identifier_agent.clone(
-    name="MeasurementTypeIdentifierAgent",
-    instructions=base_type_identifier_instructions_template.format(
-        concept_description="key types of MEASUREMENTS mentioned (e.g., Financial Metric, Physical Quantity, Performance Indicator, Survey Result, Count, Ratio, Percentage, Score)",
-        specific_constraint="Focus on the *category* or *type* of measurement being used (e.g., Financial Metric, Physical Quantity, Ratio), not necessarily the specific values.",  # Added constraint
-        concept_type_singular="measurement type",
-        list_field_name="identified_measurements",
-        item_field_name="measurement_type",
+    (
+        "EventTypeIdentifierAgent",
+        "key EVENT types (e.g., Meeting, Acquisition, Conference, Product Launch, Election, Natural Disaster, Release, Protest, Accident, Celebration)",
+        "Do NOT identify other entity types like Person, Organization, Location etc. - focus ONLY on events.",
+        "event type",
+        "identified_events",
+        "event_type",
+        EVENT_TYPE_MODEL,
+        EventTypeSchema,
     ),
-    model=MEASUREMENT_TYPE_MODEL,
-    output_type=MeasurementTypeSchema,
-)
-
-# --- Agent 4g: Modality Type Identifier ---
-modality_type_identifier_agent = base_type_identifier_agent.clone(
-    name="ModalityTypeIdentifierAgent",
-    instructions=base_type_identifier_instructions_template.format(
-        concept_description="the types of MODALITIES represented or referred to (e.g., Text, Image, Video, Audio, Table, Chart, Code Snippet, Mathematical Formula, Diagram)",
-        specific_constraint="Identify the *format or medium* of information presented or referenced (e.g., Text, Image, Table, Code Snippet).",  # Added constraint
-        concept_type_singular="modality type",
-        list_field_name="identified_modalities",
-        item_field_name="modality_type",
+    (
+        "StatementTypeIdentifierAgent",
+        "key STATEMENT types (e.g., Fact, Claim, Opinion, Question, Instruction, Hypothesis, Prediction)",
+        "Focus only on classifying the nature or type of the statement (e.g., Fact, Opinion, Claim, Hypothesis), not its specific content or truth value.",
+        "statement type",
+        "identified_statements",
+        "statement_type",
+        STATEMENT_TYPE_MODEL,
+        StatementTypeSchema,
+    ),
+    (
+        "EvidenceTypeIdentifierAgent",
+        "key types of EVIDENCE presented (e.g., Testimony, Document Reference, Statistic, Anecdote, Expert Opinion, Observation, Example, Case Study, Logical Argument)",
+        "Focus on the *form* or *category* of evidence used to support claims or statements (e.g., Statistic, Testimony, Document Reference).",
+        "evidence type",
+        "identified_evidence",
+        "evidence_type",
+        EVIDENCE_TYPE_MODEL,
+        EvidenceTypeSchema,
+    ),
+    (
+        "MeasurementTypeIdentifierAgent",
+        "key types of MEASUREMENTS mentioned (e.g., Financial Metric, Physical Quantity, Performance Indicator, Survey Result, Count, Ratio, Percentage, Score)",
+        "Focus on the *category* or *type* of measurement being used (e.g., Financial Metric, Physical Quantity, Ratio), not necessarily the specific values.",
+        "measurement type",
+        "identified_measurements",
+        "measurement_type",
+        MEASUREMENT_TYPE_MODEL,
+        MeasurementTypeSchema,
+    ),
+    (
+        "ModalityTypeIdentifierAgent",
+        "the types of MODALITIES represented or referred to (e.g., Text, Image, Video, Audio, Table, Chart, Code Snippet, Mathematical Formula, Diagram)",
+        "Identify the *format or medium* of information presented or referenced (e.g., Text, Image, Table, Code Snippet).",
+        "modality type",
+        "identified_modalities",
+        "modality_type",
+        MODALITY_TYPE_MODEL,
+        ModalityTypeSchema,
     ),
-    model=MODALITY_TYPE_MODEL,
-    output_type=ModalityTypeSchema,
 )
 
+_type_identifier_agents = {
+    spec[0]: _make_type_identifier_agent(*spec) for spec in TYPE_AGENT_SPECS
+}
+
+entity_type_identifier_agent = _type_identifier_agents["EntityTypeIdentifierAgent"]
+ontology_type_identifier_agent = _type_identifier_agents["OntologyTypeIdentifierAgent"]
+event_type_identifier_agent = _type_identifier_agents["EventTypeIdentifierAgent"]
+statement_type_identifier_agent = _type_identifier_agents[
+    "StatementTypeIdentifierAgent"
+]
+evidence_type_identifier_agent = _type_identifier_agents["EvidenceTypeIdentifierAgent"]
+measurement_type_identifier_agent = _type_identifier_agents[
+    "MeasurementTypeIdentifierAgent"
+]
+modality_type_identifier_agent = _type_identifier_agents["ModalityTypeIdentifierAgent"]
 
-# --- Base Agent for Instance Extraction (Agents 5a-5g & 6b) ---
+
+# --- Instance Extractor Factory (Agents 5a-5g & 6b) ---
 # Provides a reusable template for extracting specific instances of the previously
-# identified types. Specific extractor agents clone this base and customize the
-# placeholders for their schema fields.
+# identified types. ``_make_instance_extractor_agent`` fills in the placeholders
+# for each extractor's schema fields.
 
 base_instance_extractor_instructions_template = (
     "Extract specific {concept_description} from the provided text. "
@@ -366,124 +456,140 @@ base_instance_extractor_instructions_template = (
     "Ensure the '{list_field}' field contains all extracted items and include the 'primary_domain' and 'analyzed_sub_domains' fields from the context."
 )
 
-base_instance_extractor_agent = Agent(
-    name="BaseInstanceExtractorAgent",  # Generic name, overridden in clones
-    instructions=base_instance_extractor_instructions_template,  # Formatted in clones
-    tools=[],
-    handoffs=[],
-)
-
 
-# --- Agent 5: Entity Instance Extractor ---
-# Clone of base_instance_extractor_agent specialized for entity mentions.
-entity_instance_extractor_agent = base_instance_extractor_agent.clone(
-    name="EntityInstanceExtractorAgent",
-    instructions=base_instance_extractor_instructions_template.format(
-        concept_description="entity mentions",
-        type_list_name="entity types",
-        instance_field="entity type",
-        span_field="exact text span and character offsets",
-        list_field="identified_instances",
-    ),
-    model=ENTITY_INSTANCE_MODEL,
-    output_type=EntityInstanceSchema,
-)
+@lru_cache(maxsize=None)
+def _instance_extractor_instructions(
+    concept_description: str,
+    type_list_name: str,
+    instance_field: str,
+    span_field: str,
+    list_field: str,
+) -> str:
+    """Format ``base_instance_extractor_instructions_template`` once per argument tuple."""
+    return base_instance_extractor_instructions_template.format(
+        concept_description=concept_description,
+        type_list_name=type_list_name,
+        instance_field=instance_field,
+        span_field=span_field,
+        list_field=list_field,
+    )
 
 
-# --- Agent 5b: Ontology Instance Extractor ---
-# Clone of base_instance_extractor_agent specialized for ontology concepts.
-ontology_instance_extractor_agent = base_instance_extractor_agent.clone(
-    name="OntologyInstanceExtractorAgent",
-    instructions=base_instance_extractor_instructions_template.format(
-        concept_description="ontology concept mentions",
-        type_list_name="ontology types",
-        instance_field="ontology type",
-        span_field="exact text span and character offsets",
-        list_field="identified_instances",
-    ),
-    model=ONTOLOGY_INSTANCE_MODEL,
-    output_type=OntologyInstanceSchema,
-)
+def _make_instance_extractor_agent(
+    name: str,
+    concept_description: str,
+    type_list_name: str,
+    instance_field: str,
+    model: str,
+    output_type: Any,
+    span_field: str = "exact text span and character offsets",
+    list_field: str = "identified_instances",
+) -> Agent:
+    """Build an instance extractor from ``base_instance_extractor_instructions_template``."""
+    return Agent(
+        name=name,
+        instructions=_instance_extractor_instructions(
+            concept_description,
+            type_list_name,
+            instance_field,
+            span_field,
+            list_field,
+        ),
+        model=model,
+        output_type=output_type,
+        tools=[],
+        handoffs=[],
+    )
 
 
-# --- Agent 5c: Event Instance Extractor ---
-# Clone of base_instance_extractor_agent specialized for event mentions.
-event_instance_extractor_agent = base_instance_extractor_agent.clone(
-    name="EventInstanceExtractorAgent",
-    instructions=base_instance_extractor_instructions_template.format(
-        concept_description="event mentions",
-        type_list_name="event types",
-        instance_field="event type",
-        span_field="exact text span and character offsets",
-        list_field="identified_instances",
+# --- Agents 5a-5g: Instance Extractors ---
+# One record per agent, in ``_make_instance_extractor_agent`` argument order:
+# (name, concept_description, type_list_name, instance_field, model, output_type)
+# All of them use the default span and list fields.
+INSTANCE_AGENT_SPECS = (
+    (
+        "EntityInstanceExtractorAgent",
+        "entity mentions",
+        "entity types",
+        "entity type",
+        ENTITY_INSTANCE_MODEL,
+        EntityInstanceSchema,
     ),
-    model=EVENT_INSTANCE_MODEL,
-    output_type=EventInstanceSchema,
-)
-
-
-# --- Agent 5d: Statement Instance Extractor ---
-# Clone of base_instance_extractor_agent specialized for statement snippets.
-statement_instance_extractor_agent = base_instance_extractor_agent.clone(
-    name="StatementInstanceExtractorAgent",
-    instructions=base_instance_extractor_instructions_template.format(
-        concept_description="statement snippets",
-        type_list_name="statement types",
-        instance_field="statement type",
-        span_field="exact text span and character offsets",
-        list_field="identified_instances",
+    (
+        "OntologyInstanceExtractorAgent",
+        "ontology concept mentions",
+        "ontology types",
+        "ontology type",
+        ONTOLOGY_INSTANCE_MODEL,
+        OntologyInstanceSchema,
     ),
-    model=STATEMENT_INSTANCE_MODEL,
-    output_type=StatementInstanceSchema,
-)
-
-
-# --- Agent 5e: Evidence Instance Extractor ---
-# Clone of base_instance_extractor_agent specialized for evidence mentions.
-evidence_instance_extractor_agent = base_instance_extractor_agent.clone(
-    name="EvidenceInstanceExtractorAgent",
-    instructions=base_instance_extractor_instructions_template.format(
-        concept_description="evidence mentions",
-        type_list_name="evidence types",
-        instance_field="evidence type",
-        span_field="exact text span and character offsets",
-        list_field="identified_instances",
+    (
+        "EventInstanceExtractorAgent",
+        "event mentions",
+        "event types",
+        "event type",
+        EVENT_INSTANCE_MODEL,
+        EventInstanceSchema,
     ),
-    model=EVIDENCE_INSTANCE_MODEL,
-    output_type=EvidenceInstanceSchema,
-)
-
-
-# --- Agent 5f: Measurement Instance Extractor ---
-# Clone of base_instance_extractor_agent specialized for measurement mentions.
-measurement_instance_extractor_agent = base_instance_extractor_agent.clone(
-    name="MeasurementInstanceExtractorAgent",
-    instructions=base_instance_extractor_instructions_template.format(
-        concept_description="measurement mentions",
-        type_list_name="measurement types",
-        instance_field="measurement type",
-        span_field="exact text span and character offsets",
-        list_field="identified_instances",
+    (
+        "StatementInstanceExtractorAgent",
+        "statement snippets",
+        "statement types",
+        "statement type",
+        STATEMENT_INSTANCE_MODEL,
+        StatementInstanceSchema,
+    ),
+    (
+        "EvidenceInstanceExtractorAgent",
+        "evidence mentions",
+        "evidence types",
+        "evidence type",
+        EVIDENCE_INSTANCE_MODEL,
+        EvidenceInstanceSchema,
+    ),
+    (
+        "MeasurementInstanceExtractorAgent",
+        "measurement mentions",
+        "measurement types",
+        "measurement type",
+        MEASUREMENT_INSTANCE_MODEL,
+        MeasurementInstanceSchema,
+    ),
+    (
+        "ModalityInstanceExtractorAgent",
+        "modality references",
+        "modality types",
+        "modality type",
+        MODALITY_INSTANCE_MODEL,
+        ModalityInstanceSchema,
     ),
-    model=MEASUREMENT_INSTANCE_MODEL,
-    output_type=MeasurementInstanceSchema,
 )
 
+_instance_extractor_agents = {
+    spec[0]: _make_instance_extractor_agent(*spec) for spec in INSTANCE_AGENT_SPECS
+}
 
-# --- Agent 5g: Modality Instance Extractor ---
-# Clone of base_instance_extractor_agent specialized for modality references.
-modality_instance_extractor_agent = base_instance_extractor_agent.clone(
-    name="ModalityInstanceExtractorAgent",
-    instructions=base_instance_extractor_instructions_template.format(
-        concept_description="modality references",
-        type_list_name="modality types",
-        instance_field="modality type",
-        span_field="exact text span and character offsets",
-        list_field="identified_instances",
-    ),
-    model=MODALITY_INSTANCE_MODEL,
-    output_type=ModalityInstanceSchema,
-)
+entity_instance_extractor_agent = _instance_extractor_agents[
+    "EntityInstanceExtractorAgent"
+]
+ontology_instance_extractor_agent = _instance_extractor_agents[
+    "OntologyInstanceExtractorAgent"
+]
+event_instance_extractor_agent = _instance_extractor_agents[
+    "EventInstanceExtractorAgent"
+]
+statement_instance_extractor_agent = _instance_extractor_agents[
+    "StatementInstanceExtractorAgent"
+]
+evidence_instance_extractor_agent = _instance_extractor_agents[
+    "EvidenceInstanceExtractorAgent"
+]
+measurement_instance_extractor_agent = _instance_extractor_agents[
+    "MeasurementInstanceExtractorAgent"
+]
+modality_instance_extractor_agent = _instance_extractor_agents[
+    "ModalityInstanceExtractorAgent"
+]
 
 
 # --- Agent 6: Relationship Identifier (for one entity type) ---
@@ -501,67 +607,52 @@ relationship_type_identifier_agent = Agent(
     ),
     model=RELATIONSHIP_MODEL,
     output_type=SingleEntityTypeRelationshipSchema,
-    tools=[
-        confidence_score_agent.as_tool(
-            tool_name="confidence_score",
-            tool_description="Evaluate confidence between 0.0 and 1.0",
-        ),
-        relevance_score_agent.as_tool(
-            tool_name="relevance_score",
-            tool_description="Judge relevance between 0.0 and 1.0",
-        ),
-        clarity_score_agent.as_tool(
-            tool_name="clarity_score",
-            tool_description="Assess clarity between 0.0 and 1.0",
-        ),
-    ],
+    tools=list(SCORE_TOOLS),
     handoffs=[],
 )
 
 # --- Agent 6b: Relationship Instance Extractor ---
-# Clone of base_instance_extractor_agent specialized for relationship instances.
-relationship_extractor_agent = base_instance_extractor_agent.clone(
+# Instance extractor specialized for relationship instances.
+relationship_extractor_agent = _make_instance_extractor_agent(
     name="RelationshipInstanceExtractorAgent",
-    instructions=base_instance_extractor_instructions_template.format(
-        concept_description="subject-object relationships",
-        type_list_name="relationship types and extracted entity instances",
-        instance_field="subject, relationship type, object, and relevance score",
-        span_field="optional snippet",
-        list_field="identified_instances",
-    ),
+    concept_description="subject-object relationships",
+    type_list_name="relationship types and extracted entity instances",
+    instance_field="subject, relationship type, object, and relevance score",
+    span_field="optional snippet",
     model=RELATIONSHIP_INSTANCE_MODEL,
     output_type=RelationshipInstanceSchema,
 )
 
-# You can optionally create a list or dict to easily access all agents
-all_agents = {
-    "domain_identifier": domain_identifier_agent,
-    "domain_result": domain_result_agent,
-    "sub_domain_identifier": sub_domain_identifier_agent,
-    "sub_domain_result": sub_domain_result_agent,
-    "topic_identifier": topic_identifier_agent,
-    "topic_result": topic_result_agent,
-    "entity_type_identifier": entity_type_identifier_agent,
-    "ontology_type_identifier": ontology_type_identifier_agent,
-    "event_type_identifier": event_type_identifier_agent,
-    "statement_type_identifier": statement_type_identifier_agent,
-    "evidence_type_identifier": evidence_type_identifier_agent,
-    "measurement_type_identifier": measurement_type_identifier_agent,
-    "modality_type_identifier": modality_type_identifier_agent,
-    "entity_instance_extractor": entity_instance_extractor_agent,
-    "ontology_instance_extractor": ontology_instance_extractor_agent,
-    "event_instance_extractor": event_instance_extractor_agent,
-    "statement_instance_extractor": statement_instance_extractor_agent,
-    "evidence_instance_extractor": evidence_instance_extractor_agent,
-    "measurement_instance_extractor": measurement_instance_extractor_agent,
-    "modality_instance_extractor": modality_instance_extractor_agent,
-    "confidence_score": confidence_score_agent,
-    "relevance_score": relevance_score_agent,
-    "clarity_score": clarity_score_agent,
-    "relationship_identifier": relationship_type_identifier_agent,
-    "relationship_instance_extractor": relationship_extractor_agent,
-    # Note: Base agent is not typically included here unless used directly
-}
+# Read-only registry for easy access to all agents, keyed by short name
+_AGENT_REGISTRY = (
+    ("domain_identifier", domain_identifier_agent),
+    ("domain_result", domain_result_agent),
+    ("sub_domain_identifier", sub_domain_identifier_agent),
+    ("sub_domain_result", sub_domain_result_agent),
+    ("topic_identifier", topic_identifier_agent),
+    ("topic_batch_identifier", topic_batch_identifier_agent),
+    ("topic_result", topic_result_agent),
+    ("entity_type_identifier", entity_type_identifier_agent),
+    ("ontology_type_identifier", ontology_type_identifier_agent),
+    ("event_type_identifier", event_type_identifier_agent),
+    ("statement_type_identifier", statement_type_identifier_agent),
+    ("evidence_type_identifier", evidence_type_identifier_agent),
+    ("measurement_type_identifier", measurement_type_identifier_agent),
+    ("modality_type_identifier", modality_type_identifier_agent),
+    ("entity_instance_extractor", entity_instance_extractor_agent),
+    ("ontology_instance_extractor", ontology_instance_extractor_agent),
+    ("event_instance_extractor", event_instance_extractor_agent),
+    ("statement_instance_extractor", statement_instance_extractor_agent),
+    ("evidence_instance_extractor", evidence_instance_extractor_agent),
+    ("measurement_instance_extractor", measurement_instance_extractor_agent),
+    ("modality_instance_extractor", modality_instance_extractor_agent),
+    ("confidence_score", confidence_score_agent),
+    ("relevance_score", relevance_score_agent),
+    ("clarity_score", clarity_score_agent),
+    ("relationship_identifier", relationship_type_identifier_agent),
+    ("relationship_instance_extractor", relationship_extractor_agent),
+)
+all_agents: Mapping[str, Agent] = MappingProxyType(dict(_AGENT_REGISTRY))
 
 if "__all__" in globals():
     __all_list = cast(List[str], globals()["__all__"])